@@ -48,6 +48,11 @@ setup(
         "video": [
             "yt-dlp[default]",
         ],
+        # Faster JSON encoding for the viewer's JSON output (?format=json);
+        # the stdlib json module is used when it is absent.
+        "speedups": [
+            "orjson>=3.0.0",
+        ],
         "dev": [
             "pytest>=6.0.0",
             "pytest-cov>=2.0.0",
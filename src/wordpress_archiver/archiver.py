@@ -123,6 +123,13 @@ class WordPressArchiver:
         except Exception as e:
             logger.error(f"Error during {content_type} archiving: {e}")
             stats["errors"] += 1
+
+        # Replies can arrive before their parents; settle stored thread levels
+        if content_type == "comments" and (stats["new"] or stats["updated"]):
+            try:
+                self.db.refresh_comment_levels()
+            except Exception as e:
+                logger.error(f"Error refreshing comment levels: {e}")
         
         logger.info(f"Completed archive of {content_type}: {stats}")
         return stats
@@ -150,28 +157,16 @@ class WordPressArchiver:
         # Extract and normalize content data
         content_data = self.content_processor.extract_content_data(item, content_type)
         
-        # Check if content exists and get current hash
-        existing_hash = self.db.get_content_hash(content_type, content_data['wp_id'])
-        
-        if existing_hash is None:
-            # New content
-            self.db.insert_content(content_type, content_data, version=1)
+        # Version against the stored copy: new item, new version on a hash
+        # change, or (visible content unchanged) refresh the newest metadata on
+        # the latest version in place so history stays append-only.
+        status = self.db.store_content(content_type, content_data)
+        if status == 'new':
             stats["new"] += 1
             logger.info(f"New {content_type}: {self._get_item_title(content_data, content_type)}")
-        elif existing_hash != content_data['content_hash']:
-            # Content changed, create new version
-            latest_version = self.db.get_latest_version(content_type, content_data['wp_id'])
-            new_version = latest_version['version'] + 1 if latest_version else 2
-
-            self.db.insert_content(content_type, content_data, version=new_version)
+        elif status == 'updated':
             stats["updated"] += 1
             logger.info(f"Updated {content_type}: {self._get_item_title(content_data, content_type)}")
-        else:
-            # Visible content unchanged: keep the newest metadata current on the
-            # latest version in place (no new version, history stays append-only).
-            if content_data.get('raw_json') is not None:
-                self.db.update_latest_raw_json(
-                    content_type, content_data['wp_id'], content_data['raw_json'])
 
         # If processing a post, fetch and save category/tag details
         if content_type == 'posts' and api:
@@ -193,8 +188,8 @@ class WordPressArchiver:
                     response = api.get_category(category_id)
                     if response.data:
                         category_data = self.content_processor.extract_content_data(response.data, 'categories')
-                        self.db.insert_content('categories', category_data, version=1)
-                        logger.debug(f"Saved category: {category_data.get('name', category_id)}")
+                        if self.db.insert_content('categories', category_data, version=1):
+                            logger.debug(f"Saved category: {category_data.get('name', category_id)}")
                 except Exception as e:
                     logger.warning(f"Failed to fetch category {category_id}: {e}")
         
@@ -206,8 +201,8 @@ class WordPressArchiver:
                     response = api.get_tag(tag_id)
                     if response.data:
                         tag_data = self.content_processor.extract_content_data(response.data, 'tags')
-                        self.db.insert_content('tags', tag_data, version=1)
-                        logger.debug(f"Saved tag: {tag_data.get('name', tag_id)}")
+                        if self.db.insert_content('tags', tag_data, version=1):
+                            logger.debug(f"Saved tag: {tag_data.get('name', tag_id)}")
                 except Exception as e:
                     logger.warning(f"Failed to fetch tag {tag_id}: {e}")
     
@@ -258,14 +253,14 @@ class WordPressArchiver:
             ]
             for table, cols in scan_targets:
                 cursor.execute(f"SELECT {', '.join(cols)} FROM {table}")
-                for row in cursor.fetchall():
+                for row in cursor:
                     for value in row:
                         if value:
                             urls |= extract_urls_from_html(value, site_url)
 
             # Avatars are JSON dicts of size -> url (gravatar etc.)
             cursor.execute("SELECT avatar_urls, mpp_avatar FROM users")
-            for avatar_urls, mpp_avatar in cursor.fetchall():
+            for avatar_urls, mpp_avatar in cursor:
                 for blob in (avatar_urls, mpp_avatar):
                     if not blob:
                         continue
@@ -441,7 +436,7 @@ class WordPressArchiver:
             cursor = conn.cursor()
             for table in ('posts', 'pages', 'comments'):
                 cursor.execute(f"SELECT content FROM {table}")
-                for (content,) in cursor.fetchall():
+                for (content,) in cursor:
                     if content:
                         for embed in extract_video_embeds(content):
                             if embed not in seen:
@@ -711,24 +706,31 @@ class WordPressArchiver:
             if not items:
                 break
 
-            for item in items:
-                if limit and route_count >= limit:
-                    break
-                stats["discovered"] += 1
-                route_count += 1
-                raw = json.dumps(item, ensure_ascii=False)
-                wp_id = self._api_object_id(item, raw)
-                content_hash = hashlib.sha256(raw.encode('utf-8')).hexdigest()
-                existing = self.db.get_api_object_latest(route, wp_id)
-                if existing is None:
-                    self.db.insert_api_object(route, wp_id, raw, content_hash, version=1)
-                    stats["new"] += 1
-                elif existing.get('content_hash') != content_hash:
-                    self.db.insert_api_object(route, wp_id, raw, content_hash,
-                                              version=existing['version'] + 1)
-                    stats["updated"] += 1
-                else:
-                    stats["skipped"] += 1
+            # One transaction (and one commit) per page rather than per object.
+            # Counts are tallied per page and only added to stats once the page
+            # has committed, so a rolled-back page doesn't report phantom rows.
+            page_stats = {"discovered": 0, "new": 0, "updated": 0, "skipped": 0}
+            with self.db.transaction():
+                for item in items:
+                    if limit and route_count + page_stats["discovered"] >= limit:
+                        break
+                    page_stats["discovered"] += 1
+                    raw = json.dumps(item, ensure_ascii=False)
+                    wp_id = self._api_object_id(item, raw)
+                    content_hash = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+                    existing = self.db.get_api_object_latest(route, wp_id)
+                    if existing is None:
+                        self.db.insert_api_object(route, wp_id, raw, content_hash, version=1)
+                        page_stats["new"] += 1
+                    elif existing.get('content_hash') != content_hash:
+                        self.db.insert_api_object(route, wp_id, raw, content_hash,
+                                                  version=existing['version'] + 1)
+                        page_stats["updated"] += 1
+                    else:
+                        page_stats["skipped"] += 1
+            for key, count in page_stats.items():
+                stats[key] += count
+            route_count += page_stats["discovered"]
 
             if limit and route_count >= limit:
                 break
@@ -783,6 +785,13 @@ class WordPressArchiver:
             if len(content_types) == 1:
                 self.db.save_session_stats(content_type, stats)
         
+        # A bulk ingest moves table sizes; refresh the planner's statistics
+        if any(stats["new"] or stats["updated"] for stats in all_stats.values()):
+            try:
+                self.db.analyze()
+            except Exception as e:
+                logger.error(f"Error analyzing database: {e}")
+        
         return all_stats
     
     def get_archive_stats(self) -> Dict[str, Any]:
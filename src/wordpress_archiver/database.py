@@ -7,9 +7,18 @@ archived WordPress content with version tracking and change detection.
 """
 
 import sqlite3
+import base64
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import os
+import threading
+import weakref
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Iterable
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -34,6 +43,7 @@ POSTS_TABLE_SCHEMA = '''
         status TEXT,
         content_hash TEXT,
         version INTEGER DEFAULT 1,
+        is_latest INTEGER DEFAULT 1,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(wp_id, version)
     )
@@ -53,6 +63,9 @@ COMMENTS_TABLE_SCHEMA = '''
         status TEXT,
         content_hash TEXT,
         version INTEGER DEFAULT 1,
+        is_latest INTEGER DEFAULT 1,
+        level INTEGER DEFAULT 0,
+        post_title TEXT,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(wp_id, version),
         FOREIGN KEY (post_id) REFERENCES posts (wp_id),
@@ -73,6 +86,7 @@ PAGES_TABLE_SCHEMA = '''
         status TEXT,
         content_hash TEXT,
         version INTEGER DEFAULT 1,
+        is_latest INTEGER DEFAULT 1,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(wp_id, version)
     )
@@ -91,6 +105,7 @@ USERS_TABLE_SCHEMA = '''
         mpp_avatar TEXT,
         content_hash TEXT,
         version INTEGER DEFAULT 1,
+        is_latest INTEGER DEFAULT 1,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(wp_id, version)
     )
@@ -109,6 +124,7 @@ CATEGORIES_TABLE_SCHEMA = '''
         count INTEGER,
         content_hash TEXT,
         version INTEGER DEFAULT 1,
+        is_latest INTEGER DEFAULT 1,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(wp_id, version)
     )
@@ -126,6 +142,7 @@ TAGS_TABLE_SCHEMA = '''
         count INTEGER,
         content_hash TEXT,
         version INTEGER DEFAULT 1,
+        is_latest INTEGER DEFAULT 1,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(wp_id, version)
     )
@@ -225,23 +242,80 @@ ARCHIVE_META_TABLE_SCHEMA = '''
     )
 '''
 
+# Archived item counts per versioned table (distinct wp_ids) and the number of
+# archive sessions, kept current by triggers so get_stats and the unfiltered
+# listings read them instead of counting rows on every call.
+STATS_SUMMARY_TABLE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS stats_summary (
+        table_name TEXT PRIMARY KEY,
+        item_count INTEGER NOT NULL DEFAULT 0
+    )
+'''
+
+# Stored in PRAGMA user_version once init_database has brought a file fully up
+# to date; a file already at this version skips the schema pass on open. Bump it
+# whenever tables, migrations, triggers, FTS tables or indexes change.
+SCHEMA_VERSION = 8
+
+# Every table, in creation order, as one script for init_database.
+TABLES_SCRIPT = ";\n".join([
+    POSTS_TABLE_SCHEMA,
+    COMMENTS_TABLE_SCHEMA,
+    PAGES_TABLE_SCHEMA,
+    USERS_TABLE_SCHEMA,
+    CATEGORIES_TABLE_SCHEMA,
+    TAGS_TABLE_SCHEMA,
+    SESSIONS_TABLE_SCHEMA,
+    POST_CATEGORIES_TABLE_SCHEMA,
+    POST_TAGS_TABLE_SCHEMA,
+    MEDIA_TABLE_SCHEMA,
+    VIDEOS_TABLE_SCHEMA,
+    API_OBJECTS_TABLE_SCHEMA,
+    ARCHIVE_META_TABLE_SCHEMA,
+    STATS_SUMMARY_TABLE_SCHEMA,
+])
+
 # =============================================================================
 # DATABASE INDEXES
 # =============================================================================
 
 DATABASE_INDEXES = [
-    ("idx_posts_wp_id", "posts", "wp_id"),
     ("idx_posts_date_created", "posts", "date_created"),
-    ("idx_comments_wp_id", "comments", "wp_id"),
-    ("idx_comments_post_id", "comments", "post_id"),
     ("idx_comments_parent_id", "comments", "parent_id"),
     ("idx_comments_date_created", "comments", "date_created"),
-    ("idx_pages_wp_id", "pages", "wp_id"),
+    ("idx_comments_post_date", "comments", "post_id, date_created"),
     ("idx_pages_date_created", "pages", "date_created"),
-    ("idx_users_wp_id", "users", "wp_id"),
-    ("idx_categories_wp_id", "categories", "wp_id"),
-    ("idx_tags_wp_id", "tags", "wp_id"),
-    ("idx_sessions_date", "archive_sessions", "session_date"),
+    # Latest-version rows only (see VERSIONED_TABLES)
+    ("idx_posts_latest", "posts", "wp_id", "is_latest = 1"),
+    ("idx_comments_latest", "comments", "wp_id", "is_latest = 1"),
+    ("idx_pages_latest", "pages", "wp_id", "is_latest = 1"),
+    ("idx_users_latest", "users", "wp_id", "is_latest = 1"),
+    ("idx_categories_latest", "categories", "wp_id", "is_latest = 1"),
+    ("idx_tags_latest", "tags", "wp_id", "is_latest = 1"),
+    # get_stats last_updated (per-table MAX(created_at))
+    ("idx_posts_created_at", "posts", "created_at"),
+    ("idx_comments_created_at", "comments", "created_at"),
+    ("idx_pages_created_at", "pages", "created_at"),
+    ("idx_users_created_at", "users", "created_at"),
+    ("idx_categories_created_at", "categories", "created_at"),
+    ("idx_tags_created_at", "tags", "created_at"),
+    # Covering (wp_id, version, content_hash): change detection reads the newest
+    # hash from the index alone, without touching the wide content row
+    ("idx_posts_wp_ver_hash", "posts", "wp_id, version DESC, content_hash"),
+    ("idx_comments_wp_ver_hash", "comments", "wp_id, version DESC, content_hash"),
+    ("idx_pages_wp_ver_hash", "pages", "wp_id, version DESC, content_hash"),
+    ("idx_users_wp_ver_hash", "users", "wp_id, version DESC, content_hash"),
+    ("idx_categories_wp_ver_hash", "categories", "wp_id, version DESC, content_hash"),
+    ("idx_tags_wp_ver_hash", "tags", "wp_id, version DESC, content_hash"),
+    # Keyset pagination sort keys, NULL folded to '' (see KEYSET_PAGINATION).
+    # The sessions key also serves get_stats recent_sessions (newest first).
+    ("idx_sessions_key", "archive_sessions", "COALESCE(session_date, ''), id"),
+    ("idx_posts_latest_key", "posts", "COALESCE(date_created, ''), wp_id", "is_latest = 1"),
+    ("idx_pages_latest_key", "pages", "COALESCE(date_created, ''), wp_id", "is_latest = 1"),
+    ("idx_comments_latest_key", "comments", "COALESCE(date_created, ''), wp_id", "is_latest = 1"),
+    ("idx_users_latest_key", "users", "COALESCE(name, ''), wp_id", "is_latest = 1"),
+    ("idx_categories_latest_key", "categories", "COALESCE(name, ''), wp_id", "is_latest = 1"),
+    ("idx_tags_latest_key", "tags", "COALESCE(name, ''), wp_id", "is_latest = 1"),
     ("idx_post_categories_post", "post_categories", "post_wp_id"),
     ("idx_post_categories_category", "post_categories", "category_wp_id"),
     ("idx_post_tags_post", "post_tags", "post_wp_id"),
@@ -256,9 +330,394 @@ DATABASE_INDEXES = [
     ("idx_api_objects_endpoint_wpid_ver", "api_objects", "endpoint, wp_id, version"),
 ]
 
+# Indexes dropped from existing archives. The single-column wp_id index of
+# each versioned table is a prefix of its idx_{table}_wp_ver_hash (and of the
+# UNIQUE(wp_id, version) autoindex), as idx_comments_post_id is of
+# idx_comments_post_date. No query reads idx_posts_status_date,
+# idx_comments_thread_page, idx_comments_root_level or idx_comments_roots:
+# listings seek on the *_latest_key indexes and threads are built in Python
+# from post_id rows. The plain-column sort-key indexes gave way to the
+# COALESCE ones when keyset pagination started folding NULL keys to ''.
+SUPERSEDED_INDEXES = [
+    "idx_posts_wp_id", "idx_comments_wp_id", "idx_pages_wp_id",
+    "idx_users_wp_id", "idx_categories_wp_id", "idx_tags_wp_id",
+    "idx_comments_post_id", "idx_posts_status_date", "idx_comments_thread_page",
+    "idx_comments_root_level", "idx_comments_roots",
+    "idx_sessions_date", "idx_posts_latest_date", "idx_pages_latest_date",
+    "idx_comments_latest_date", "idx_users_latest_name", "idx_categories_latest_name",
+    "idx_tags_latest_name",
+]
+
+# DATABASE_INDEXES (and the SUPERSEDED_INDEXES drops) as one script for
+# init_database.
+INDEXES_SCRIPT = ";\n".join(
+    [f"DROP INDEX IF EXISTS {index_name}" for index_name in SUPERSEDED_INDEXES] + [
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"
+        + (f" WHERE {where[0]}" if where else "")
+        for index_name, table, columns, *where in DATABASE_INDEXES
+    ]
+)
+
+# INSERT statement per versioned content table; parameter tuples are built by
+# DatabaseManager._content_params in the same column order. OR IGNORE against
+# UNIQUE(wp_id, version): a version that is already stored (e.g. written by a
+# concurrent run) is skipped rather than raising, and rowcount reports it.
+CONTENT_INSERT_SQL = {
+    'posts': '''
+        INSERT OR IGNORE INTO posts
+        (wp_id, title, content, excerpt, author_id, date_created,
+         date_modified, status, content_hash, version, raw_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'comments': '''
+        INSERT OR IGNORE INTO comments
+        (wp_id, post_id, parent_id, author_name, author_email, author_url,
+         content, date_created, status, content_hash, version, raw_json,
+         level, post_title)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                (SELECT title FROM posts WHERE wp_id = ? ORDER BY version DESC LIMIT 1))
+    ''',
+    'pages': '''
+        INSERT OR IGNORE INTO pages
+        (wp_id, title, content, excerpt, author_id, date_created,
+         date_modified, status, content_hash, version, raw_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'users': '''
+        INSERT OR IGNORE INTO users
+        (wp_id, name, url, description, link, slug, avatar_urls,
+         mpp_avatar, content_hash, version, raw_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'categories': '''
+        INSERT OR IGNORE INTO categories
+        (wp_id, name, description, link, slug, taxonomy, parent,
+         count, content_hash, version, raw_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'tags': '''
+        INSERT OR IGNORE INTO tags
+        (wp_id, name, description, link, slug, taxonomy, count,
+         content_hash, version, raw_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+}
+
+# Leading CONTENT_INSERT_SQL columns per table, read from a ContentProcessor
+# dict by one itemgetter call. _content_params appends the rest: the users
+# avatar columns as JSON text, then content_hash, version and raw_json.
+# Comments also need thread levels and are built on their own.
+CONTENT_INSERT_FIELDS = {
+    'posts': itemgetter('wp_id', 'title', 'content', 'excerpt', 'author_id',
+                        'date_created', 'date_modified', 'status'),
+    'pages': itemgetter('wp_id', 'title', 'content', 'excerpt', 'author_id',
+                        'date_created', 'date_modified', 'status'),
+    'users': itemgetter('wp_id', 'name', 'url', 'description', 'link', 'slug'),
+    'categories': itemgetter('wp_id', 'name', 'description', 'link', 'slug',
+                             'taxonomy', 'parent', 'count'),
+    'tags': itemgetter('wp_id', 'name', 'description', 'link', 'slug',
+                       'taxonomy', 'count'),
+}
+
+# Full-text search shadow tables (FTS5): searchable columns per content table.
+# External-content tables index every row of the base table by rowid (id). The
+# trigram tokenizer keeps the semantics of the LIKE '%term%' search it replaces:
+# case-insensitive substring match anywhere in the text.
+FTS_TABLES = {
+    'posts': ('title', 'content'),
+    'pages': ('title', 'content'),
+    'comments': ('author_name', 'content'),
+    'users': ('name', 'description'),
+    'categories': ('name', 'description'),
+    'tags': ('name', 'description'),
+}
+
+# Trigram queries need at least three characters; shorter terms use LIKE.
+FTS_MIN_TERM_LENGTH = 3
+
 # Versioned content tables that gain a raw_json column via migration.
 RAW_JSON_TABLES = ['posts', 'comments', 'pages', 'users', 'categories', 'tags']
 
+# Versioned content tables. Each row carries is_latest (1 on the newest version
+# of its wp_id), kept current on insert, so "latest version" is an equality
+# filter instead of a MAX(version) subquery.
+VERSIONED_TABLES = ['posts', 'comments', 'pages', 'users', 'categories', 'tags']
+
+# Per-table lookups used on every archived item, built once so each call hands
+# sqlite3 an identical string and hits its prepared-statement cache. Keyed by
+# content type, which doubles as the whitelist for the table name.
+CONTENT_EXISTS_SQL = {
+    table: f"SELECT 1 FROM {table} WHERE wp_id = ? LIMIT 1"
+    for table in VERSIONED_TABLES
+}
+CONTENT_HASH_SQL = {
+    table: f"SELECT content_hash, version FROM {table} WHERE wp_id = ? ORDER BY version DESC LIMIT 1"
+    for table in VERSIONED_TABLES
+}
+CONTENT_LATEST_SQL = {
+    table: f"SELECT * FROM {table} WHERE wp_id = ? ORDER BY version DESC LIMIT 1"
+    for table in VERSIONED_TABLES
+}
+# (LIMIT -1 is SQLite for "no limit", so one statement serves both cases; the
+# DESC order is read straight off the UNIQUE(wp_id, version) index, no sort.)
+CONTENT_VERSIONS_SQL = {
+    table: f"SELECT * FROM {table} WHERE wp_id = ? ORDER BY version DESC LIMIT ?"
+    for table in VERSIONED_TABLES
+}
+LATEST_RAW_JSON_UPDATE_SQL = {
+    table: f"UPDATE {table} SET raw_json = ? WHERE wp_id = ? AND is_latest = 1"
+    for table in VERSIONED_TABLES
+}
+# Clears is_latest on the versions a newly inserted one supersedes
+RETIRE_LATEST_SQL = {
+    table: f"UPDATE {table} SET is_latest = 0 WHERE wp_id = ? AND version < ? AND is_latest = 1"
+    for table in VERSIONED_TABLES
+}
+
+# get_stats counters, as one SELECT of scalar subqueries (one round trip).
+STATS_COUNTS_SQL = "SELECT " + ",\n       ".join(
+    [f"(SELECT item_count FROM stats_summary WHERE table_name = '{table}') AS total_{table}"
+     for table in VERSIONED_TABLES] + [
+        "(SELECT COUNT(*) FROM media WHERE status = 'ok') AS total_media",
+        "(SELECT COUNT(*) FROM videos WHERE status = 'downloaded') AS total_videos",
+        "(SELECT COUNT(*) FROM (SELECT DISTINCT endpoint, wp_id FROM api_objects)) AS total_api_objects",
+        "(SELECT item_count FROM stats_summary WHERE table_name = 'archive_sessions') AS total_sessions",
+    ]
+)
+
+# Newest created_at across content tables. The MAX sits inside each branch so
+# every branch is a single idx_{table}_created_at lookup, not a table scan.
+LAST_UPDATED_SQL = "SELECT MAX(m) AS last_updated FROM (\n" + "\n    UNION ALL\n".join(
+    f"    SELECT MAX(created_at) AS m FROM {table}" for table in VERSIONED_TABLES
+) + "\n)"
+
+# Keyset ("seek") pagination per listing: the condition that continues after
+# the previous page's last row, and that row's sort-key columns. A listing
+# reached with such a cursor seeks into its index instead of reading and
+# discarding OFFSET rows, so a deep page costs the same as the first.
+# A NULL sort key would never compare true, so keys are ordered and sought as
+# COALESCE(column, '') (NULL sorts where it did, beside ''), and
+# next_page_cursor writes a NULL key as ''. SQLite only seeks an expression
+# index on a plain range, so each condition leads with one on the first key
+# (bound to the cursor's first value; see _keyset_condition).
+KEYSET_PAGINATION = {
+    'posts': ("COALESCE(p.date_created, '') <= ? AND (COALESCE(p.date_created, ''), p.wp_id) < (?, ?)",
+              ('date_created', 'wp_id')),
+    'pages': ("COALESCE(date_created, '') <= ? AND (COALESCE(date_created, ''), wp_id) < (?, ?)",
+              ('date_created', 'wp_id')),
+    'comments': ("COALESCE(date_created, '') <= ? AND (COALESCE(date_created, ''), wp_id) < (?, ?)",
+                 ('date_created', 'wp_id')),
+    'users': ("COALESCE(name, '') >= ? AND (COALESCE(name, ''), wp_id) > (?, ?)",
+              ('name', 'wp_id')),
+    'categories': ("COALESCE(name, '') >= ? AND (COALESCE(name, ''), wp_id) > (?, ?)",
+                   ('name', 'wp_id')),
+    'tags': ("COALESCE(name, '') >= ? AND (COALESCE(name, ''), wp_id) > (?, ?)",
+             ('name', 'wp_id')),
+    'sessions': ("COALESCE(session_date, '') <= ? AND (COALESCE(session_date, ''), id) < (?, ?)",
+                 ('session_date', 'id')),
+}
+
+# Latest-version listings served by get_paginated_listing: the FROM clause
+# (with the listed table under ``alias`` when it has one), the selected columns
+# and the sort order, which matches the listing's KEYSET_PAGINATION key.
+ListingQuery = namedtuple('ListingQuery', ['source', 'alias', 'columns', 'order_by'])
+LISTING_QUERIES = {
+    # Posts carry their author's name from the latest user version
+    'posts': ListingQuery(
+        "posts p LEFT JOIN users u ON p.author_id = u.wp_id AND u.is_latest = 1", 'p',
+        """p.wp_id, p.title, p.excerpt, p.author_id,
+           p.date_created, p.date_modified, p.status, p.version, p.created_at,
+           COALESCE(u.name, 'Unknown') as author_name""",
+        "COALESCE(p.date_created, '') DESC, p.wp_id DESC"),
+    'pages': ListingQuery(
+        "pages", "",
+        """wp_id, title, excerpt, author_id, date_created, date_modified,
+           status, version, created_at""",
+        "COALESCE(date_created, '') DESC, wp_id DESC"),
+    'users': ListingQuery(
+        "users", "",
+        """wp_id, name, url, description, link, slug, avatar_urls,
+           mpp_avatar, version, created_at""",
+        "COALESCE(name, '') ASC, wp_id ASC"),
+    'categories': ListingQuery(
+        "categories", "",
+        """wp_id, name, description, link, slug, taxonomy, parent,
+           count, version, created_at""",
+        "COALESCE(name, '') ASC, wp_id ASC"),
+    'tags': ListingQuery(
+        "tags", "",
+        """wp_id, name, description, link, slug, taxonomy, count,
+           version, created_at""",
+        "COALESCE(name, '') ASC, wp_id ASC"),
+}
+
+# Per-connection tuning applied on every open, as one script. journal_mode=WAL
+# is persistent in the database file, so it is set once in init_database.
+CONNECTION_PRAGMAS = """
+    PRAGMA synchronous = NORMAL;      -- safe with WAL; no fsync per commit
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;       -- ~64 MB page cache
+    PRAGMA mmap_size = 268435456;     -- 256 MiB memory-mapped reads
+"""
+
+# Rows sampled per index by analyze(); bounds ANALYZE on large archives while
+# still giving the planner realistic row-count estimates.
+ANALYSIS_LIMIT = 1000
+
+# Prepared statements kept per connection (sqlite3's default is 128). Every
+# statement is a fixed string or built from a fixed set of fragments, but the
+# listing variants (search mode x seek x total) across all tables, plus the
+# per-table write statements, outgrow the default and would be re-prepared.
+STATEMENT_CACHE_SIZE = 256
+
+# archive_sessions.errors values written by save_session_stats, serialized once
+SESSION_ERRORS_NONE = json.dumps([])
+SESSION_ERRORS_OCCURRED = json.dumps(["Errors occurred"])
+
+# Whether a session's errors value reports a failure, decided in SQL with JSON1
+# so session listings need no per-row json.loads. An errors list also holds
+# content summaries, so only entries naming an error count. Text that is not
+# JSON is searched as a whole. (LIKE is case-insensitive for ASCII.)
+SESSION_HAS_ERRORS_SQL = """
+    CASE
+        WHEN errors IS NULL OR errors = '' THEN 0
+        WHEN NOT json_valid(errors) THEN errors LIKE '%error%' OR errors LIKE '%failed%'
+        WHEN json_type(errors) = 'array' THEN EXISTS (
+            SELECT 1 FROM json_each(errors)
+            WHERE value LIKE '%error%' OR value LIKE '%failed%' OR value LIKE '%exception%')
+        ELSE 0
+    END"""
+
+# Words that mark an archive_sessions.errors entry as a failure (see
+# SESSION_HAS_ERRORS_SQL and session_has_errors)
+SESSION_ERROR_WORDS = ('error', 'failed', 'exception')
+
+# Rendered /comments pages kept per DatabaseManager (see get_paginated_comments).
+COMMENT_PAGE_CACHE_SIZE = 1024
+
+# archive_meta key counting in-place rewrites of listed comment columns
+# (level, post_title). Stored in the file so every process's /comments
+# cache sees a refresh made by another, such as the archiver.
+COMMENT_GENERATION_KEY = 'comment_generation'
+
+# Threaded per-post comment lists and archive sessions kept per DatabaseManager
+# (see get_post_comments and get_session_by_id).
+POST_COMMENTS_CACHE_SIZE = 64
+SESSION_CACHE_SIZE = 256
+
+# Display indentation per comment nesting level, capped so deep threads stay
+# readable (set as 'indent_px' by _thread_comments).
+COMMENT_INDENT_PX = 20
+COMMENT_INDENT_MAX_PX = 200
+
+# Flat /comments page. Id-first, hydrate-later: the inner query filters, sorts
+# and pages over narrow (id, date_created, wp_id) rows only; the wide columns are
+# then fetched for just the per_page surviving ids. post_title is denormalized
+# onto comments, so no posts join is needed. Columns are in CommentRow field
+# order, followed by the search total, so rows map onto CommentRow positionally.
+# Only search variants carry a window count (total_column): over the whole
+# table it would read every latest row before the first could be returned, so
+# the unfiltered total comes from stats_summary instead.
+COMMENTS_PAGE_SQL = '''
+    SELECT
+        c.wp_id, c.author_name, c.author_email, c.author_url, c.content,
+        c.date_created, c.status, c.version, c.parent_id,
+        c.post_title, c.post_id, COALESCE(c.level, 0), hits._total
+    FROM (
+        SELECT id, {total_column} AS _total FROM comments
+        WHERE is_latest = 1
+        {search_clause}
+        {seek_clause}
+        ORDER BY COALESCE(date_created, '') DESC, wp_id DESC
+        LIMIT ? OFFSET ?
+    ) hits
+    JOIN comments c ON c.id = hits.id
+    ORDER BY COALESCE(c.date_created, '') DESC, c.wp_id DESC
+'''
+
+# Search filters of the /comments page statements, by search mode
+COMMENTS_SEARCH_CLAUSES = {
+    'all': "",
+    'like': "AND (author_name LIKE ? OR content LIKE ?)",
+    'fts': "AND id IN (SELECT rowid FROM comments_fts WHERE comments_fts MATCH ?)",
+}
+
+# One row of the flat /comments listing. A slots-backed namedtuple instead of a
+# dict per row: smaller, faster attribute access, and read-only once built.
+# Templates read it by attribute; call ._asdict() at a JSON boundary.
+CommentRow = namedtuple('CommentRow', [
+    'wp_id', 'author_name', 'author_email', 'author_url', 'content',
+    'date_created', 'status', 'version', 'parent_id', 'post_title', 'post_id',
+    'level',
+])
+
+
+def session_has_errors(errors: Optional[str]) -> bool:
+    """
+    Whether a session's errors value reports a failure.
+
+    Python twin of SESSION_HAS_ERRORS_SQL, for SQLite builds without JSON1.
+    """
+    if not errors:
+        return False
+    try:
+        entries = json.loads(errors)
+    except (ValueError, TypeError):
+        text = str(errors).lower()
+        return 'error' in text or 'failed' in text
+    if not isinstance(entries, list):
+        return False
+    return any(word in str(entry).lower()
+               for entry in entries for word in SESSION_ERROR_WORDS)
+
+
+def next_page_cursor(listing: str, rows) -> Optional[str]:
+    """
+    Opaque cursor for the page after ``rows`` of a KEYSET_PAGINATION listing.
+
+    Pass it back as ``after`` to fetch the next page by seeking instead of by
+    OFFSET. Returns None for an empty page.
+    """
+    if not rows:
+        return None
+    _, columns = KEYSET_PAGINATION[listing]
+    last = rows[-1]
+    if isinstance(last, tuple):
+        # namedtuple rows (CommentRow) are read by field name
+        last = last._asdict()
+    key = [last[column] if last[column] is not None else '' for column in columns]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+
+def _decode_page_cursor(token: str, size: int) -> Optional[list]:
+    """Sort key from next_page_cursor, or None if the token is not usable."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, UnicodeError):
+        return None
+    # next_page_cursor writes NULL keys as ''; a token holding one uses OFFSET
+    if not isinstance(key, list) or len(key) != size or None in key:
+        return None
+    return key
+
+
+def _content_sql(statements: Dict[str, str], content_type: str) -> str:
+    """Look up a per-table statement, rejecting unknown content types."""
+    try:
+        return statements[content_type]
+    except KeyError:
+        raise ValueError(f"Unknown content type: {content_type}") from None
+
+
+class _ThreadConnection:
+    """A thread's reusable connection plus its get_connection() nesting depth."""
+
+    __slots__ = ('conn', 'depth', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.depth = 0
+
 # =============================================================================
 # DATABASE MANAGER CLASS
 # =============================================================================
@@ -282,63 +741,214 @@ class DatabaseManager:
             db_path: Path to the SQLite database file
         """
         self.db_path = Path(db_path)
+        # One connection per thread, reused across calls (see get_connection).
+        # Held weakly so a finished thread's connection is released with it.
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        self._comment_page_cache = lru_cache(maxsize=COMMENT_PAGE_CACHE_SIZE)(self._load_comment_page)
+        self._post_comments_cache = lru_cache(maxsize=POST_COMMENTS_CACHE_SIZE)(self._load_post_comments)
+        self._session_cache = lru_cache(maxsize=SESSION_CACHE_SIZE)(self._load_session)
+        # Comment page statements by (search mode, seeking past a cursor),
+        # rendered once and reused verbatim
+        seek_clause = "AND " + KEYSET_PAGINATION['comments'][0]
+        self._stmt_comments = {
+            (mode, seeking): COMMENTS_PAGE_SQL.format(
+                total_column="COUNT(*) OVER ()" if clause else "NULL",
+                search_clause=clause, seek_clause=seek_clause if seeking else "")
+            for mode, clause in COMMENTS_SEARCH_CLAUSES.items()
+            for seeking in (False, True)
+        }
+        # Set by init_database once the FTS5 tables are known to be usable
+        self._fts_enabled = False
+        # Set by init_database: whether this SQLite build has the JSON1 functions
+        self._json1_enabled = False
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection to the archive."""
+        # check_same_thread=False only so close_all() may close it from another
+        # thread; each connection is otherwise used by its owning thread alone.
+        # isolation_level=None: autocommit, no implicit BEGIN from sqlite3.
+        # Single statements commit on their own; multi-statement writes open
+        # an explicit one with transaction().
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(CONNECTION_PRAGMAS)
+        return conn
+
     @contextmanager
     def get_connection(self):
         """
         Context manager for database connections.
+
+        Each thread reuses one connection across calls, keeping SQLite's page
+        and statement caches warm instead of reopening the file per query.
+        Nested use within a thread shares the same connection; when the
+        outermost block exits, any transaction left open is rolled back, as
+        closing the connection used to do.
         
         Yields:
             SQLite connection with row factory configured
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _ThreadConnection(self._connect())
+            self._local.holder = holder
+            with self._connections_lock:
+                self._connections.add(holder)
+        holder.depth += 1
         try:
-            yield conn
+            yield holder.conn
         finally:
-            conn.close()
+            holder.depth -= 1
+            if holder.depth == 0 and holder.conn.in_transaction:
+                holder.conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager for a write transaction on this thread's connection.
+
+        Commits when the block completes and rolls back if it raises.
+        BEGIN IMMEDIATE takes the write lock up front, so a concurrent writer
+        waits at the start rather than failing halfway through the block. A
+        block entered while a transaction is already open joins it.
+
+        Yields:
+            SQLite connection inside the transaction
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @contextmanager
+    def read_transaction(self):
+        """
+        Context manager for a sequence of reads on one snapshot.
+
+        Wraps the block in a single deferred transaction, so several queries
+        (a detail page's versions, comments and taxonomy) see the same
+        snapshot and share one transaction boundary instead of one per
+        statement. A block entered while a transaction is already open joins it.
+
+        Yields:
+            SQLite connection inside the transaction
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close_all(self):
+        """Close every pooled connection; threads reconnect on next use."""
+        with self._connections_lock:
+            holders = list(self._connections)
+            self._connections.clear()
+            self._local = threading.local()
+        for holder in holders:
+            try:
+                # Cheap no-op unless the planner has gathered stats worth refreshing
+                holder.conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            holder.conn.close()
     
+    def analyze(self):
+        """
+        Refresh the query planner's table and index statistics.
+
+        Run after a bulk archive pass, when row counts have moved enough for
+        the planner's estimates to go stale. Sampled (see ANALYSIS_LIMIT), so
+        it stays cheap on large archives.
+        """
+        with self.get_connection() as conn:
+            conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            conn.execute("ANALYZE")
+
     def init_database(self):
-        """Initialize the SQLite database with required tables and indexes."""
-        logger.info(f"Initializing database: {self.db_path}")
-        
+        """
+        Initialize the SQLite database with required tables and indexes.
+
+        A file already at SCHEMA_VERSION is left as is, so opening an existing
+        archive costs one PRAGMA read instead of the full schema pass.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Create tables
-            self._create_tables(cursor)
+            self._json1_enabled = self._json1_usable(cursor)
+            if cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                self._fts_enabled = self._search_index_usable(cursor)
+                return
 
-            # Apply additive migrations to pre-existing databases
-            self._apply_migrations(cursor)
+            logger.info(f"Initializing database: {self.db_path}")
 
-            # Create indexes
-            self._create_indexes(cursor)
+            # Write-ahead logging lets the web viewer read while an archive run writes.
+            # Must run outside a transaction, so it goes before the DDL batch.
+            self._enable_wal(cursor)
 
-            conn.commit()
+            # Tables, migrations and triggers in one transaction: sqlite3 would
+            # otherwise autocommit (and sync) each statement separately. The
+            # script's BEGIN stays open for the Python-side steps below.
+            try:
+                cursor.executescript(f"BEGIN;\n{TABLES_SCRIPT};")
+
+                # Apply additive migrations to pre-existing databases
+                self._apply_migrations(cursor)
+
+                # Trigger-maintained item counts for get_stats
+                self._create_stats_summary(cursor)
+
+                # Full-text search tables (optional; LIKE search without them)
+                self._create_search_index(cursor)
+
+                conn.commit()
+
+                # Indexes go last, in a transaction of their own: they depend on
+                # migrated columns, and executescript() commits anything pending
+                # before it runs.
+                cursor.executescript(
+                    f"BEGIN;\n{INDEXES_SCRIPT};\n"
+                    f"PRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;"
+                )
+            except Exception:
+                conn.rollback()
+                raise
 
         logger.info("Database schema initialized successfully")
 
-    def _create_tables(self, cursor):
-        """Create all database tables."""
-        schemas = [
-            POSTS_TABLE_SCHEMA,
-            COMMENTS_TABLE_SCHEMA,
-            PAGES_TABLE_SCHEMA,
-            USERS_TABLE_SCHEMA,
-            CATEGORIES_TABLE_SCHEMA,
-            TAGS_TABLE_SCHEMA,
-            SESSIONS_TABLE_SCHEMA,
-            POST_CATEGORIES_TABLE_SCHEMA,
-            POST_TAGS_TABLE_SCHEMA,
-            MEDIA_TABLE_SCHEMA,
-            VIDEOS_TABLE_SCHEMA,
-            API_OBJECTS_TABLE_SCHEMA,
-            ARCHIVE_META_TABLE_SCHEMA,
-        ]
-
-        for schema in schemas:
-            cursor.execute(schema)
+    def _enable_wal(self, cursor):
+        """
+        Switch the database to WAL journal mode when it is safe to do so.
+
+        WAL needs to create -wal/-shm files next to the database; on a read-only
+        directory keep the default rollback journal rather than failing.
+        """
+        db_dir = self.db_path.resolve().parent
+        if not os.access(db_dir, os.W_OK):
+            logger.warning(f"Database directory not writable, keeping rollback journal: {db_dir}")
+            return
+        try:
+            mode = cursor.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            if mode.lower() != 'wal':
+                logger.warning(f"WAL journal mode unavailable, using: {mode}")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not enable WAL journal mode: {e}")
 
     def _column_exists(self, cursor, table: str, column: str) -> bool:
         """Return True if a column already exists on a table."""
@@ -357,15 +967,174 @@ class DatabaseManager:
                 cursor.execute(f"ALTER TABLE {table} ADD COLUMN raw_json TEXT")
                 logger.info(f"Migration: added {table}.raw_json")
 
-    def _create_indexes(self, cursor):
-        """Create database indexes for better query performance."""
-        for index_name, table, column in DATABASE_INDEXES:
+        for table in VERSIONED_TABLES:
+            if not self._column_exists(cursor, table, 'is_latest'):
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN is_latest INTEGER DEFAULT 1")
+                cursor.execute(f"""
+                    UPDATE {table} SET is_latest = 0
+                    WHERE version < (SELECT MAX(version) FROM {table} t WHERE t.wp_id = {table}.wp_id)
+                """)
+                logger.info(f"Migration: added {table}.is_latest")
+
+        # Materialized thread depth of each comment (see refresh_comment_levels)
+        if not self._column_exists(cursor, 'comments', 'level'):
+            cursor.execute("ALTER TABLE comments ADD COLUMN level INTEGER DEFAULT 0")
+            updated = self._refresh_comment_levels(cursor)
+            logger.info(f"Migration: added comments.level ({updated} rows backfilled)")
+
+        # comments.root_id was stored beside level but never read
+        if self._column_exists(cursor, 'comments', 'root_id'):
             try:
-                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})")
-            except sqlite3.OperationalError:
-                # Index might already exist
-                pass
-    
+                # An index on the column blocks DROP COLUMN (see SUPERSEDED_INDEXES)
+                cursor.execute("DROP INDEX IF EXISTS idx_comments_root_level")
+                cursor.execute("ALTER TABLE comments DROP COLUMN root_id")
+                logger.info("Migration: dropped comments.root_id")
+            except sqlite3.OperationalError as e:
+                # DROP COLUMN needs SQLite 3.35; an older build just stops writing it
+                logger.warning(f"Could not drop comments.root_id: {e}")
+
+        # Title of the comment's post, denormalized for the /comments listing
+        if not self._column_exists(cursor, 'comments', 'post_title'):
+            cursor.execute("ALTER TABLE comments ADD COLUMN post_title TEXT")
+            updated = self._refresh_comment_post_titles(cursor)
+            logger.info(f"Migration: added comments.post_title ({updated} rows backfilled)")
+
+        # Top-level comments are stored with parent_id NULL; older archives used 0
+        cursor.execute("UPDATE comments SET parent_id = NULL WHERE parent_id = 0")
+        if cursor.rowcount:
+            logger.info(f"Migration: normalized {cursor.rowcount} comments.parent_id 0 -> NULL")
+
+    def _create_stats_summary(self, cursor):
+        """
+        Create the triggers that keep stats_summary current, seeding missing rows.
+
+        A table's count goes up when the first version of a wp_id is inserted
+        and down when the last one is deleted; new versions leave it unchanged.
+        The archive_sessions count follows every insert and delete.
+        """
+        cursor.execute("SELECT table_name FROM stats_summary")
+        seeded = {row[0] for row in cursor}
+        for table in VERSIONED_TABLES:
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_count_ai AFTER INSERT ON {table}
+                WHEN NOT EXISTS (SELECT 1 FROM {table} WHERE wp_id = new.wp_id AND id != new.id)
+                BEGIN
+                    UPDATE stats_summary SET item_count = item_count + 1 WHERE table_name = '{table}';
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_count_ad AFTER DELETE ON {table}
+                WHEN NOT EXISTS (SELECT 1 FROM {table} WHERE wp_id = old.wp_id)
+                BEGIN
+                    UPDATE stats_summary SET item_count = item_count - 1 WHERE table_name = '{table}';
+                END
+            """)
+            if table not in seeded:
+                cursor.execute(f"""
+                    INSERT INTO stats_summary (table_name, item_count)
+                    SELECT '{table}', COUNT(*) FROM {table} WHERE is_latest = 1
+                """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS archive_sessions_count_ai AFTER INSERT ON archive_sessions
+            BEGIN
+                UPDATE stats_summary SET item_count = item_count + 1 WHERE table_name = 'archive_sessions';
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS archive_sessions_count_ad AFTER DELETE ON archive_sessions
+            BEGIN
+                UPDATE stats_summary SET item_count = item_count - 1 WHERE table_name = 'archive_sessions';
+            END
+        """)
+        if 'archive_sessions' not in seeded:
+            cursor.execute("""
+                INSERT INTO stats_summary (table_name, item_count)
+                SELECT 'archive_sessions', COUNT(*) FROM archive_sessions
+            """)
+
+    def _create_search_index(self, cursor):
+        """
+        Create the FTS5 search tables and the triggers that keep them in sync.
+
+        A table created over existing rows is filled with a one-time rebuild.
+        If this SQLite build lacks FTS5 or the trigram tokenizer, search keeps
+        using LIKE.
+        """
+        self._fts_enabled = False
+        for table, columns in FTS_TABLES.items():
+            fts = f"{table}_fts"
+            cols = ", ".join(columns)
+            new_cols = ", ".join(f"new.{c}" for c in columns)
+            old_cols = ", ".join(f"old.{c}" for c in columns)
+
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,))
+            existed = cursor.fetchone() is not None
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                    f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')"
+                )
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Full-text search unavailable, using LIKE search: {e}")
+                return
+
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+                    INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+                END
+            """)
+            if not existed:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                logger.info(f"Built full-text index {fts}")
+        self._fts_enabled = True
+
+    def _search_index_usable(self, cursor) -> bool:
+        """Whether every FTS_TABLES index exists and this SQLite build can read it."""
+        try:
+            for table in FTS_TABLES:
+                cursor.execute(f"SELECT 1 FROM {table}_fts LIMIT 0")
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    @staticmethod
+    def _json1_usable(cursor) -> bool:
+        """Whether this SQLite build has the JSON1 functions (json_valid, json_each)."""
+        try:
+            cursor.execute("SELECT json_valid('[]')")
+        except sqlite3.OperationalError:
+            logger.warning("SQLite JSON1 unavailable, session errors are checked in Python")
+            return False
+        return True
+
+    def _search_condition(self, table: str, search: str, alias: str = "") -> tuple:
+        """
+        SQL condition and parameters matching ``search`` in a table's text columns.
+
+        Goes through the FTS5 index when available; terms shorter than a
+        trigram (or builds without FTS5) fall back to LIKE '%term%'.
+        """
+        prefix = f"{alias}." if alias else ""
+        if self._fts_enabled and len(search) >= FTS_MIN_TERM_LENGTH:
+            phrase = '"' + search.replace('"', '""') + '"'
+            return (f"{prefix}id IN (SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ?)",
+                    [phrase])
+        columns = FTS_TABLES[table]
+        like = " OR ".join(f"{prefix}{column} LIKE ?" for column in columns)
+        return f"({like})", [f'%{search}%'] * len(columns)
+
     # =============================================================================
     # CONTENT OPERATIONS
     # =============================================================================
@@ -381,10 +1150,9 @@ class DatabaseManager:
         Returns:
             True if content exists, False otherwise
         """
+        sql = _content_sql(CONTENT_EXISTS_SQL, content_type)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT 1 FROM {content_type} WHERE wp_id = ? LIMIT 1", (wp_id,))
-            return cursor.fetchone() is not None
+            return conn.execute(sql, (wp_id,)).fetchone() is not None
     
     def get_content_hash(self, content_type: str, wp_id: int) -> Optional[str]:
         """
@@ -397,36 +1165,27 @@ class DatabaseManager:
         Returns:
             Content hash string or None if not found
         """
+        sql = _content_sql(CONTENT_HASH_SQL, content_type)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT content_hash FROM {content_type} 
-                WHERE wp_id = ? 
-                ORDER BY version DESC 
-                LIMIT 1
-            """, (wp_id,))
-            result = cursor.fetchone()
+            result = conn.execute(sql, (wp_id,)).fetchone()
             return result[0] if result else None
     
-    def get_content_versions(self, content_type: str, wp_id: int) -> List[Dict[str, Any]]:
+    def get_content_versions(self, content_type: str, wp_id: int,
+                             limit: Optional[int] = None) -> List[sqlite3.Row]:
         """
-        Get all versions of a specific content item.
+        Get all versions of a specific content item, newest first.
         
         Args:
             content_type: Type of content (posts, comments, pages, etc.)
             wp_id: WordPress ID of the content
+            limit: Return only the newest ``limit`` versions (default: all)
             
         Returns:
-            List of content versions as dictionaries
+            List of content versions as rows (index or column-name access)
         """
+        sql = _content_sql(CONTENT_VERSIONS_SQL, content_type)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT * FROM {content_type} 
-                WHERE wp_id = ? 
-                ORDER BY version DESC 
-            """, (wp_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            return conn.execute(sql, (wp_id, -1 if limit is None else limit)).fetchall()
     
     def get_latest_version(self, content_type: str, wp_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -439,135 +1198,323 @@ class DatabaseManager:
         Returns:
             Latest version as dictionary or None if not found
         """
+        sql = _content_sql(CONTENT_LATEST_SQL, content_type)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT * FROM {content_type} 
-                WHERE wp_id = ? 
-                ORDER BY version DESC 
-                LIMIT 1
-            """, (wp_id,))
-            result = cursor.fetchone()
+            result = conn.execute(sql, (wp_id,)).fetchone()
             return dict(result) if result else None
     
-    def insert_content(self, content_type: str, data: Dict[str, Any], version: int = 1):
+    def get_user_names(self, wp_ids: Iterable[int]) -> Dict[int, str]:
         """
-        Insert new content into the database.
+        Latest-version names for a set of users, in one query.
         
+        Args:
+            wp_ids: WordPress user IDs (duplicates and falsy IDs are ignored)
+            
+        Returns:
+            Dictionary of wp_id -> name for the users that are archived
+        """
+        ids = sorted({wp_id for wp_id in wp_ids if wp_id})
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self.get_connection() as conn:
+            return dict(conn.execute(
+                f"SELECT wp_id, name FROM users WHERE is_latest = 1 AND wp_id IN ({placeholders})",
+                ids
+            ).fetchall())
+    
+    def store_content(self, content_type: str, data: Dict[str, Any]) -> str:
+        """
+        Archive one item, versioning it against what is already stored.
+
+        The newest stored (content_hash, version) comes from one covering-index
+        lookup; the item is then inserted as version 1, inserted as the next
+        version if its hash changed, or (unchanged) has raw_json refreshed on
+        the latest version in place. Lookup and write share one transaction,
+        so a concurrent run cannot claim the same version number in between.
+
+        Args:
+            content_type: Type of content (posts, comments, pages, etc.)
+            data: Content data dictionary (as produced by ContentProcessor)
+
+        Returns:
+            'new', 'updated' or 'unchanged'
+        """
+        sql = _content_sql(CONTENT_HASH_SQL, content_type)
+        with self.transaction() as conn:
+            latest = conn.execute(sql, (data['wp_id'],)).fetchone()
+            if latest is None:
+                self.insert_many(content_type, [data], version=1)
+                return 'new'
+            if latest[0] != data['content_hash']:
+                self.insert_many(content_type, [data], version=latest[1] + 1)
+                return 'updated'
+            if data.get('raw_json') is not None:
+                self.update_latest_raw_json(content_type, data['wp_id'], data['raw_json'])
+            return 'unchanged'
+
+    def insert_content(self, content_type: str, data: Dict[str, Any], version: int = 1) -> int:
+        """
+        Insert new content into the database.
+
         Args:
             content_type: Type of content (posts, comments, pages, etc.)
             data: Content data dictionary
             version: Version number (default: 1)
+
+        Returns:
+            1 if the row was inserted, 0 if that version was already stored
         """
-        with self.get_connection() as conn:
+        return self.insert_many(content_type, [data], version)
+
+    def insert_many(self, content_type: str, rows: Iterable[Dict[str, Any]], version: int = 1) -> int:
+        """
+        Insert many content items in a single transaction.
+
+        One executemany() per table and one commit for the whole batch, instead
+        of a statement and a commit per item.
+
+        Args:
+            content_type: Type of content (posts, comments, pages, etc.)
+            rows: Content data dictionaries (as produced by ContentProcessor)
+            version: Version number for every row (default: 1)
+
+        Returns:
+            Number of rows inserted (versions already stored are skipped)
+        """
+        sql = CONTENT_INSERT_SQL.get(content_type)
+        rows = list(rows)
+        if sql is None or not rows:
+            return 0
+
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            
-            if content_type == 'posts':
-                cursor.execute('''
-                    INSERT INTO posts
-                    (wp_id, title, content, excerpt, author_id, date_created,
-                     date_modified, status, content_hash, version, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['wp_id'], data['title'], data['content'], data['excerpt'],
-                    data['author_id'], data['date_created'], data['date_modified'],
-                    data['status'], data['content_hash'], version, data.get('raw_json')
-                ))
-                
-                # Save post-category relationships
-                category_ids = data.get('categories', [])
-                if category_ids:
-                    for category_id in category_ids:
-                        try:
-                            cursor.execute('''
-                                INSERT OR IGNORE INTO post_categories 
-                                (post_wp_id, category_wp_id, version)
-                                VALUES (?, ?, ?)
-                            ''', (data['wp_id'], category_id, version))
-                        except sqlite3.IntegrityError:
-                            # Relationship already exists for this version
-                            pass
-                
-                # Save post-tag relationships
-                tag_ids = data.get('tags', [])
-                if tag_ids:
-                    for tag_id in tag_ids:
-                        try:
-                            cursor.execute('''
-                                INSERT OR IGNORE INTO post_tags 
-                                (post_wp_id, tag_wp_id, version)
-                                VALUES (?, ?, ?)
-                            ''', (data['wp_id'], tag_id, version))
-                        except sqlite3.IntegrityError:
-                            # Relationship already exists for this version
-                            pass
-            elif content_type == 'comments':
-                cursor.execute('''
-                    INSERT INTO comments
-                    (wp_id, post_id, parent_id, author_name, author_email, author_url,
-                     content, date_created, status, content_hash, version, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['wp_id'], data['post_id'], data['parent_id'],
-                    data['author_name'], data['author_email'], data['author_url'],
-                    data['content'], data['date_created'], data['status'],
-                    data['content_hash'], version, data.get('raw_json')
-                ))
-            elif content_type == 'pages':
-                cursor.execute('''
-                    INSERT INTO pages
-                    (wp_id, title, content, excerpt, author_id, date_created,
-                     date_modified, status, content_hash, version, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['wp_id'], data['title'], data['content'], data['excerpt'],
-                    data['author_id'], data['date_created'], data['date_modified'],
-                    data['status'], data['content_hash'], version, data.get('raw_json')
-                ))
-            elif content_type == 'users':
-                # Convert dict fields to JSON strings for SQLite
-                avatar_urls = data.get('avatar_urls', '')
-                if isinstance(avatar_urls, dict):
-                    avatar_urls = json.dumps(avatar_urls)
-                
-                mpp_avatar = data.get('mpp_avatar', '')
-                if isinstance(mpp_avatar, dict):
-                    mpp_avatar = json.dumps(mpp_avatar)
-                
-                cursor.execute('''
-                    INSERT INTO users
-                    (wp_id, name, url, description, link, slug, avatar_urls,
-                     mpp_avatar, content_hash, version, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['wp_id'], data['name'], data['url'], data['description'],
-                    data['link'], data['slug'], avatar_urls,
-                    mpp_avatar, data['content_hash'], version, data.get('raw_json')
-                ))
-            elif content_type == 'categories':
-                cursor.execute('''
-                    INSERT INTO categories
-                    (wp_id, name, description, link, slug, taxonomy, parent,
-                     count, content_hash, version, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['wp_id'], data['name'], data['description'], data['link'],
-                    data['slug'], data['taxonomy'], data['parent'], data['count'],
-                    data['content_hash'], version, data.get('raw_json')
-                ))
-            elif content_type == 'tags':
-                cursor.execute('''
-                    INSERT INTO tags
-                    (wp_id, name, description, link, slug, taxonomy, count,
-                     content_hash, version, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['wp_id'], data['name'], data['description'], data['link'],
-                    data['slug'], data['taxonomy'], data['count'],
-                    data['content_hash'], version, data.get('raw_json')
-                ))
-            
-            conn.commit()
+
+            if content_type == 'comments':
+                params = self._comment_insert_params(cursor, rows, version)
+            else:
+                params = [self._content_params(content_type, data, version) for data in rows]
+            cursor.executemany(sql, params)
+            inserted = cursor.rowcount
+
+            # Nothing new (every version already stored): the follow-up writes
+            # were done when those rows were first inserted
+            if inserted:
+                # The new rows are the latest versions; retire the ones they supersede
+                if version > 1:
+                    cursor.executemany(
+                        RETIRE_LATEST_SQL[content_type],
+                        [(data['wp_id'], version) for data in rows]
+                    )
+
+                if content_type == 'posts':
+                    self._insert_post_relations(cursor, rows, version)
+        return inserted
+
+    def _content_params(self, content_type: str, data: Dict[str, Any], version: int,
+                        level: int = 0) -> tuple:
+        """Build the CONTENT_INSERT_SQL parameter tuple for one item."""
+        if content_type == 'comments':
+            return (
+                # WordPress reports top-level comments as parent 0; store NULL
+                data['wp_id'], data['post_id'], data['parent_id'] or None,
+                data['author_name'], data['author_email'], data['author_url'],
+                data['content'], data['date_created'], data['status'],
+                data['content_hash'], version, data.get('raw_json'),
+                level, data['post_id']
+            )
+        params = CONTENT_INSERT_FIELDS[content_type](data)
+        if content_type == 'users':
+            # Convert dict fields to JSON strings for SQLite
+            avatar_urls = data.get('avatar_urls', '')
+            if isinstance(avatar_urls, dict):
+                avatar_urls = json.dumps(avatar_urls)
+
+            mpp_avatar = data.get('mpp_avatar', '')
+            if isinstance(mpp_avatar, dict):
+                mpp_avatar = json.dumps(mpp_avatar)
+
+            params += (avatar_urls, mpp_avatar)
+        return params + (data['content_hash'], version, data.get('raw_json'))
+
+    def _comment_insert_params(self, cursor, rows: List[Dict[str, Any]], version: int) -> List[tuple]:
+        """Parameter tuples for a comment batch, with thread levels resolved."""
+        levels = {}
+        params = []
+        for data in rows:
+            wp_id, parent_id = data['wp_id'], data['parent_id'] or None
+            if parent_id in levels and parent_id != wp_id:
+                # Parent is earlier in this batch, so not yet visible in the table
+                level = levels[parent_id] + 1
+            else:
+                level = self._comment_level(cursor, wp_id, parent_id)
+            levels[wp_id] = level
+            params.append(self._content_params('comments', data, version, level))
+        return params
+
+    def _insert_post_relations(self, cursor, rows: List[Dict[str, Any]], version: int):
+        """Save post-category/tag links for a batch and sync comment post titles."""
+        # Keep the denormalized title on these posts' comments current
+        cursor.executemany(
+            "UPDATE comments SET post_title = ? WHERE post_id = ? AND post_title IS NOT ?",
+            [(data['title'], data['wp_id'], data['title']) for data in rows]
+        )
+
+        # Save post-category relationships (OR IGNORE: already linked at this version)
+        cursor.executemany('''
+            INSERT OR IGNORE INTO post_categories
+            (post_wp_id, category_wp_id, version)
+            VALUES (?, ?, ?)
+        ''', [(data['wp_id'], category_id, version)
+              for data in rows for category_id in data.get('categories') or []])
+
+        # Save post-tag relationships
+        cursor.executemany('''
+            INSERT OR IGNORE INTO post_tags
+            (post_wp_id, tag_wp_id, version)
+            VALUES (?, ?, ?)
+        ''', [(data['wp_id'], tag_id, version)
+              for data in rows for tag_id in data.get('tags') or []])
+
+    def _comment_level(self, cursor, wp_id: int, parent_id: Optional[int]) -> int:
+        """
+        Derive a comment's thread level from its already-stored parent.
+
+        A parent that hasn't been archived yet makes the comment a provisional
+        root; refresh_comment_levels() corrects it once the parent arrives.
+        """
+        if parent_id and parent_id != wp_id:
+            cursor.execute(
+                "SELECT level FROM comments WHERE wp_id = ? ORDER BY version DESC LIMIT 1",
+                (parent_id,)
+            )
+            parent = cursor.fetchone()
+            if parent:
+                return (parent[0] or 0) + 1
+        return 0
+
+    def refresh_comment_post_titles(self) -> int:
+        """
+        Re-sync comments.post_title with the latest version of each post.
+
+        Inserts keep it current on their own; this is the maintenance pass for
+        archives written before the column existed or edited out of band.
+
+        Returns:
+            Number of comment rows updated
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            updated = self._refresh_comment_post_titles(cursor)
+            if updated:
+                self._bump_comment_generation(cursor)
+        return updated
+
+    def _bump_comment_generation(self, cursor):
+        """Record an in-place rewrite of listed comment columns (see COMMENT_GENERATION_KEY)."""
+        cursor.execute("""
+            INSERT INTO archive_meta (key, value) VALUES (?, '1')
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        """, (COMMENT_GENERATION_KEY,))
+
+    def _refresh_comment_post_titles(self, cursor) -> int:
+        """Re-sync comment post titles on an open cursor; returns rows changed."""
+        cursor.execute("""
+            UPDATE comments SET post_title = (
+                SELECT title FROM posts WHERE posts.wp_id = comments.post_id
+                ORDER BY version DESC LIMIT 1
+            )
+            WHERE post_title IS NOT (
+                SELECT title FROM posts WHERE posts.wp_id = comments.post_id
+                ORDER BY version DESC LIMIT 1
+            )
+        """)
+        return cursor.rowcount
+
+    def refresh_comment_levels(self) -> int:
+        """
+        Recompute the stored level of every comment.
+
+        The API returns replies before their parents, so levels assigned at
+        insert time can be provisional. Run once after a comments archive pass.
+
+        Returns:
+            Number of comment rows whose level changed
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            updated = self._refresh_comment_levels(cursor)
+            if updated:
+                self._bump_comment_generation(cursor)
+        return updated
+
+    def _refresh_comment_levels(self, cursor) -> int:
+        """Recompute comment levels on an open cursor; returns rows changed."""
+        cursor.execute("""
+            SELECT wp_id, parent_id FROM comments
+            WHERE is_latest = 1
+            ORDER BY wp_id
+        """)
+        rows = cursor.fetchall()
+
+        # Whole-forest rebuild over dense integer indices: parent, first_child
+        # and next_sibling are flat int arrays (4 bytes per edge) rather than
+        # per-comment dicts, and traversal is index arithmetic.
+        n = len(rows)
+        ids = array('q', (wp_id for wp_id, _ in rows))
+        index = {wp_id: i for i, wp_id in enumerate(ids)}
+        parent = array('i', [-1]) * n
+        for i, (_, parent_id) in enumerate(rows):
+            p = index.get(parent_id, -1) if parent_id else -1
+            if p != i:                 # self-reference -> root
+                parent[i] = p          # missing parent (orphan) stays -1 -> root
+
+        first_child = array('i', [-1]) * n
+        next_sibling = array('i', [-1]) * n
+        for i in range(n - 1, -1, -1):  # reversed so siblings link in row order
+            p = parent[i]
+            if p >= 0:
+                next_sibling[i] = first_child[p]
+                first_child[p] = i
+
+        level = array('i', [-1]) * n
+        stack = array('i')
+
+        def assign_subtree(top: int):
+            level[top] = 0
+            stack.append(top)
+            while stack:
+                node = stack.pop()
+                child = first_child[node]
+                while child >= 0:
+                    if level[child] < 0:
+                        level[child] = level[node] + 1
+                        stack.append(child)
+                    child = next_sibling[child]
+
+        for i in range(n):
+            if parent[i] < 0:
+                assign_subtree(i)
+
+        # Anything still unassigned hangs off a parent cycle. Walk up from it to
+        # the first node whose parent is already on the path and make that the
+        # root, the same way the threaded post view breaks cycles.
+        for i in range(n):
+            if level[i] < 0:
+                node, on_path = i, {i}
+                while parent[node] not in on_path:
+                    node = parent[node]
+                    on_path.add(node)
+                assign_subtree(node)
+
+        cursor.executemany(
+            """
+            UPDATE comments SET level = ?
+            WHERE wp_id = ? AND level IS NOT ?
+            """,
+            [(level[i], ids[i], level[i]) for i in range(n)]
+        )
+        return cursor.rowcount
 
     # =============================================================================
     # LOSSLESS ARCHIVE STORES (media blobs, videos, raw endpoints, meta)
@@ -581,15 +1528,9 @@ class DatabaseManager:
         metadata changed, so the newest metadata stays current while content
         history remains strictly append-only.
         """
+        sql = _content_sql(LATEST_RAW_JSON_UPDATE_SQL, content_type)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                UPDATE {content_type} SET raw_json = ?
-                WHERE wp_id = ? AND version = (
-                    SELECT MAX(version) FROM {content_type} WHERE wp_id = ?
-                )
-            """, (raw_json, wp_id, wp_id))
-            conn.commit()
+            conn.execute(sql, (raw_json, wp_id))
 
     # --- media -----------------------------------------------------------------
 
@@ -605,7 +1546,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT url_hash FROM media WHERE status != 'failed'")
-            return {row[0] for row in cursor.fetchall()}
+            return {row[0] for row in cursor}
 
     def permanently_failed_media_hashes(self) -> set:
         """url_hashes of media that failed with a permanent HTTP status
@@ -619,7 +1560,7 @@ class DatabaseManager:
                 f"SELECT url_hash FROM media WHERE status = 'failed' "
                 f"AND http_status IN ({placeholders})",
                 PERMANENT_FAILURE_STATUSES)
-            return {row[0] for row in cursor.fetchall()}
+            return {row[0] for row in cursor}
 
     def insert_media(self, url_hash: str, url: str, content: Optional[bytes],
                      content_hash: Optional[str], mime_type: Optional[str],
@@ -635,7 +1576,6 @@ class DatabaseManager:
                 mime_type or 'application/octet-stream',
                 len(content) if content else 0, status, http_status
             ))
-            conn.commit()
 
     def permalink_index(self) -> List[tuple]:
         """(permalink, content_type, wp_id) for the latest version of every post
@@ -652,15 +1592,13 @@ class DatabaseManager:
             for content_type in ('posts', 'pages'):
                 try:
                     cursor.execute(
-                        f"SELECT p.wp_id, json_extract(p.raw_json, '$.link') "
-                        f"FROM {content_type} p "
-                        f"JOIN (SELECT wp_id, MAX(version) mv FROM {content_type} "
-                        f"GROUP BY wp_id) m ON m.wp_id = p.wp_id AND m.mv = p.version")
+                        f"SELECT wp_id, json_extract(raw_json, '$.link') "
+                        f"FROM {content_type} WHERE is_latest = 1")
                 except sqlite3.OperationalError as e:
                     logger.warning(
                         "permalink_index: internal-link rewriting disabled (%s)", e)
                     return out
-                for wp_id, link in cursor.fetchall():
+                for wp_id, link in cursor:
                     if link:
                         out.append((link, content_type, wp_id))
         return out
@@ -679,7 +1617,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT url_hash FROM videos WHERE status = 'downloaded'")
-            return {row[0] for row in cursor.fetchall()}
+            return {row[0] for row in cursor}
 
     def insert_video(self, url_hash: str, embed_url: str, local_path: Optional[str],
                      title: Optional[str], file_ext: Optional[str], file_size: int,
@@ -691,7 +1629,6 @@ class DatabaseManager:
                 (url_hash, embed_url, local_path, title, file_ext, file_size, status, error_message)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (url_hash, embed_url, local_path, title, file_ext, file_size, status, error_message))
-            conn.commit()
 
     # --- api_objects (REST discovery completeness net) -------------------------
 
@@ -714,7 +1651,6 @@ class DatabaseManager:
                 INSERT INTO api_objects (endpoint, wp_id, raw_json, content_hash, version)
                 VALUES (?, ?, ?, ?, ?)
             ''', (endpoint, wp_id, raw_json, content_hash, version))
-            conn.commit()
 
     def get_api_endpoints(self) -> List[Dict[str, Any]]:
         with self.get_connection() as conn:
@@ -758,7 +1694,6 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute("INSERT OR REPLACE INTO archive_meta (key, value) VALUES (?, ?)",
                            (key, value))
-            conn.commit()
 
     def get_meta(self, key: str) -> Optional[str]:
         with self.get_connection() as conn:
@@ -770,8 +1705,56 @@ class DatabaseManager:
     # =============================================================================
     # POST RELATIONSHIPS (CATEGORIES AND TAGS)
     # =============================================================================
+
+    def _keyset_condition(self, listing: str, after: Optional[str], offset: int) -> tuple:
+        """
+        Seek condition for a keyset-paginated listing.
+
+        Returns (condition, params, offset): the condition continuing after the
+        cursor's row with offset 0, or an empty condition and the given offset
+        when there is no usable cursor. The first key value is bound twice, for
+        the condition's leading range and for its row-value comparison.
+        """
+        condition, columns = KEYSET_PAGINATION[listing]
+        key = _decode_page_cursor(after, len(columns)) if after else None
+        if key is None:
+            return "", [], offset
+        return condition, [key[0]] + key, 0
+
+    def _page_total(self, cursor, rows: list, offset: int, seek: str, count_sql: str, params) -> int:
+        """
+        Total match count for a keyset-capable listing page.
+
+        Read from the window count like _window_total, except on a page reached
+        by seeking: there the window only sees rows after the cursor, so the
+        matches are counted separately.
+        """
+        if seek:
+            cursor.execute(count_sql, params)
+            return cursor.fetchone()[0]
+        return self._window_total(cursor, rows, offset, count_sql, params)
+
+    def _summary_total(self, cursor, table_name: str) -> int:
+        """Unfiltered listing total, read from the trigger-maintained stats_summary."""
+        cursor.execute("SELECT item_count FROM stats_summary WHERE table_name = ?", (table_name,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def _window_total(self, cursor, rows: list, offset: int, count_sql: str, params) -> int:
+        """
+        Total match count for a page fetched with ``COUNT(*) OVER () AS _total``.
+
+        Any row of a non-empty page carries the total. Only a page past the end
+        needs the separate COUNT(*) round trip.
+        """
+        if rows:
+            return rows[0]['_total']
+        if offset == 0:
+            return 0
+        cursor.execute(count_sql, params)
+        return cursor.fetchone()[0]
     
-    def get_post_categories(self, post_wp_id: int, version: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_post_categories(self, post_wp_id: int, version: Optional[int] = None) -> List[sqlite3.Row]:
         """
         Get categories for a specific post.
         
@@ -780,55 +1763,21 @@ class DatabaseManager:
             version: Specific version (if None, gets latest version)
             
         Returns:
-            List of category dictionaries
+            List of category rows
         """
+        version_sql, params = self._post_version_condition('pc', post_wp_id, version)
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            if version is None:
-                # Get latest version of post
-                latest_post = self.get_latest_version('posts', post_wp_id)
-                if not latest_post:
-                    return []
-                version = latest_post['version']
-            
-            # Get category IDs for this post version
-            cursor.execute('''
-                SELECT category_wp_id 
-                FROM post_categories 
-                WHERE post_wp_id = ? AND version = ?
-            ''', (post_wp_id, version))
-            category_ids = [row[0] for row in cursor.fetchall()]
-            
-            if not category_ids:
-                return []
-            
-            # Get category details
-            placeholders = ','.join(['?'] * len(category_ids))
             cursor.execute(f'''
-                SELECT wp_id, name, description, link, slug, taxonomy, parent, count
-                FROM categories
-                WHERE wp_id IN ({placeholders})
-                AND (wp_id, version) IN (SELECT wp_id, MAX(version) FROM categories GROUP BY wp_id)
-                ORDER BY name ASC
-            ''', category_ids)
-            
-            categories = []
-            for row in cursor.fetchall():
-                categories.append({
-                    'wp_id': row[0],
-                    'name': row[1],
-                    'description': row[2],
-                    'link': row[3],
-                    'slug': row[4],
-                    'taxonomy': row[5],
-                    'parent': row[6],
-                    'count': row[7]
-                })
-            
-            return categories
+                SELECT c.wp_id, c.name, c.description, c.link, c.slug, c.taxonomy, c.parent, c.count
+                FROM post_categories pc
+                INNER JOIN categories c ON c.wp_id = pc.category_wp_id AND c.is_latest = 1
+                WHERE pc.post_wp_id = ? AND {version_sql}
+                ORDER BY c.name ASC
+            ''', params)
+            return cursor.fetchall()
     
-    def get_post_tags(self, post_wp_id: int, version: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_post_tags(self, post_wp_id: int, version: Optional[int] = None) -> List[sqlite3.Row]:
         """
         Get tags for a specific post.
         
@@ -837,52 +1786,27 @@ class DatabaseManager:
             version: Specific version (if None, gets latest version)
             
         Returns:
-            List of tag dictionaries
+            List of tag rows
         """
+        version_sql, params = self._post_version_condition('pt', post_wp_id, version)
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            if version is None:
-                # Get latest version of post
-                latest_post = self.get_latest_version('posts', post_wp_id)
-                if not latest_post:
-                    return []
-                version = latest_post['version']
-            
-            # Get tag IDs for this post version
-            cursor.execute('''
-                SELECT tag_wp_id 
-                FROM post_tags 
-                WHERE post_wp_id = ? AND version = ?
-            ''', (post_wp_id, version))
-            tag_ids = [row[0] for row in cursor.fetchall()]
-            
-            if not tag_ids:
-                return []
-            
-            # Get tag details
-            placeholders = ','.join(['?'] * len(tag_ids))
             cursor.execute(f'''
-                SELECT wp_id, name, description, link, slug, taxonomy, count
-                FROM tags
-                WHERE wp_id IN ({placeholders})
-                AND (wp_id, version) IN (SELECT wp_id, MAX(version) FROM tags GROUP BY wp_id)
-                ORDER BY name ASC
-            ''', tag_ids)
-            
-            tags = []
-            for row in cursor.fetchall():
-                tags.append({
-                    'wp_id': row[0],
-                    'name': row[1],
-                    'description': row[2],
-                    'link': row[3],
-                    'slug': row[4],
-                    'taxonomy': row[5],
-                    'count': row[6]
-                })
-            
-            return tags
+                SELECT t.wp_id, t.name, t.description, t.link, t.slug, t.taxonomy, t.count
+                FROM post_tags pt
+                INNER JOIN tags t ON t.wp_id = pt.tag_wp_id AND t.is_latest = 1
+                WHERE pt.post_wp_id = ? AND {version_sql}
+                ORDER BY t.name ASC
+            ''', params)
+            return cursor.fetchall()
+    
+    def _post_version_condition(self, alias: str, post_wp_id: int,
+                                version: Optional[int]) -> tuple:
+        """Version filter for a post link table; the latest post version when None."""
+        if version is None:
+            return (f"{alias}.version = (SELECT version FROM posts WHERE wp_id = ? AND is_latest = 1)",
+                    (post_wp_id, post_wp_id))
+        return f"{alias}.version = ?", (post_wp_id, version)
     
     def get_posts_by_category(self, category_wp_id: int, page: int = 1, per_page: int = 10) -> tuple:
         """
@@ -901,36 +1825,28 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get total count of posts with this category
-            cursor.execute('''
-                SELECT COUNT(DISTINCT p.wp_id)
-                FROM posts p
-                INNER JOIN post_categories pc ON p.wp_id = pc.post_wp_id AND pc.version = p.version
-                WHERE pc.category_wp_id = ?
-                AND p.version = (
-                    SELECT MAX(version) FROM posts WHERE wp_id = p.wp_id
-                )
-            ''', (category_wp_id,))
-            total_posts = cursor.fetchone()[0]
-            
             # Get posts for current page with author names
             cursor.execute('''
-                SELECT DISTINCT p.wp_id, p.title, p.excerpt, p.author_id, 
+                SELECT p.wp_id, p.title, p.excerpt, p.author_id, 
                        p.date_created, p.date_modified, p.status, p.version, p.created_at,
-                       COALESCE(u.name, 'Unknown') as author_name
+                       COALESCE(u.name, 'Unknown') as author_name,
+                       COUNT(*) OVER () AS _total
                 FROM posts p
                 INNER JOIN post_categories pc ON p.wp_id = pc.post_wp_id AND pc.version = p.version
-                LEFT JOIN users u ON p.author_id = u.wp_id AND u.version = (
-                    SELECT MAX(version) FROM users WHERE wp_id = u.wp_id
-                )
+                LEFT JOIN users u ON p.author_id = u.wp_id AND u.is_latest = 1
                 WHERE pc.category_wp_id = ?
-                AND p.version = (
-                    SELECT MAX(version) FROM posts WHERE wp_id = p.wp_id
-                )
+                AND p.is_latest = 1
                 ORDER BY p.date_created DESC
                 LIMIT ? OFFSET ?
             ''', (category_wp_id, per_page, offset))
             posts = cursor.fetchall()
+            total_posts = self._window_total(cursor, posts, offset, '''
+                SELECT COUNT(*)
+                FROM posts p
+                INNER JOIN post_categories pc ON p.wp_id = pc.post_wp_id AND pc.version = p.version
+                WHERE pc.category_wp_id = ?
+                AND p.is_latest = 1
+            ''', (category_wp_id,))
         
         total_pages = (total_posts + per_page - 1) // per_page
         return posts, total_posts, total_pages
@@ -952,36 +1868,28 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get total count of posts with this tag
-            cursor.execute('''
-                SELECT COUNT(DISTINCT p.wp_id)
-                FROM posts p
-                INNER JOIN post_tags pt ON p.wp_id = pt.post_wp_id AND pt.version = p.version
-                WHERE pt.tag_wp_id = ?
-                AND p.version = (
-                    SELECT MAX(version) FROM posts WHERE wp_id = p.wp_id
-                )
-            ''', (tag_wp_id,))
-            total_posts = cursor.fetchone()[0]
-            
             # Get posts for current page with author names
             cursor.execute('''
-                SELECT DISTINCT p.wp_id, p.title, p.excerpt, p.author_id, 
+                SELECT p.wp_id, p.title, p.excerpt, p.author_id, 
                        p.date_created, p.date_modified, p.status, p.version, p.created_at,
-                       COALESCE(u.name, 'Unknown') as author_name
+                       COALESCE(u.name, 'Unknown') as author_name,
+                       COUNT(*) OVER () AS _total
                 FROM posts p
                 INNER JOIN post_tags pt ON p.wp_id = pt.post_wp_id AND pt.version = p.version
-                LEFT JOIN users u ON p.author_id = u.wp_id AND u.version = (
-                    SELECT MAX(version) FROM users WHERE wp_id = u.wp_id
-                )
+                LEFT JOIN users u ON p.author_id = u.wp_id AND u.is_latest = 1
                 WHERE pt.tag_wp_id = ?
-                AND p.version = (
-                    SELECT MAX(version) FROM posts WHERE wp_id = p.wp_id
-                )
+                AND p.is_latest = 1
                 ORDER BY p.date_created DESC
                 LIMIT ? OFFSET ?
             ''', (tag_wp_id, per_page, offset))
             posts = cursor.fetchall()
+            total_posts = self._window_total(cursor, posts, offset, '''
+                SELECT COUNT(*)
+                FROM posts p
+                INNER JOIN post_tags pt ON p.wp_id = pt.post_wp_id AND pt.version = p.version
+                WHERE pt.tag_wp_id = ?
+                AND p.is_latest = 1
+            ''', (tag_wp_id,))
         
         total_pages = (total_posts + per_page - 1) // per_page
         return posts, total_posts, total_pages
@@ -1003,34 +1911,26 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get total count of posts by this author
-            cursor.execute('''
-                SELECT COUNT(*)
-                FROM posts p
-                WHERE p.author_id = ?
-                AND p.version = (
-                    SELECT MAX(version) FROM posts WHERE wp_id = p.wp_id
-                )
-            ''', (author_id,))
-            total_posts = cursor.fetchone()[0]
-            
-            # Get posts for current page with author names
+            # Get posts for current page with author names (total as a window count)
             cursor.execute('''
                 SELECT p.wp_id, p.title, p.excerpt, p.author_id, 
                        p.date_created, p.date_modified, p.status, p.version, p.created_at,
-                       COALESCE(u.name, 'Unknown') as author_name
+                       COALESCE(u.name, 'Unknown') as author_name,
+                       COUNT(*) OVER () AS _total
                 FROM posts p
-                LEFT JOIN users u ON p.author_id = u.wp_id AND u.version = (
-                    SELECT MAX(version) FROM users WHERE wp_id = u.wp_id
-                )
+                LEFT JOIN users u ON p.author_id = u.wp_id AND u.is_latest = 1
                 WHERE p.author_id = ?
-                AND p.version = (
-                    SELECT MAX(version) FROM posts WHERE wp_id = p.wp_id
-                )
+                AND p.is_latest = 1
                 ORDER BY p.date_created DESC
                 LIMIT ? OFFSET ?
             ''', (author_id, per_page, offset))
             posts = cursor.fetchall()
+            total_posts = self._window_total(cursor, posts, offset, '''
+                SELECT COUNT(*)
+                FROM posts p
+                WHERE p.author_id = ?
+                AND p.is_latest = 1
+            ''', (author_id,))
         
         total_pages = (total_posts + per_page - 1) // per_page
         return posts, total_posts, total_pages
@@ -1058,9 +1958,8 @@ class DatabaseManager:
                 stats["processed"],
                 stats["new"],
                 stats["updated"],
-                json.dumps([]) if stats["errors"] == 0 else json.dumps(["Errors occurred"])
+                SESSION_ERRORS_NONE if stats["errors"] == 0 else SESSION_ERRORS_OCCURRED
             ))
-            conn.commit()
     
     def save_comprehensive_session_stats(self, domain: str, content_types: list, 
                                        all_stats: Dict[str, Dict[str, int]], interrupted: bool = False):
@@ -1073,19 +1972,21 @@ class DatabaseManager:
             all_stats: Dictionary of statistics for each content type
             interrupted: Whether the operation was interrupted
         """
-        total_processed = sum(stats["processed"] for stats in all_stats.values())
-        total_new = sum(stats["new"] for stats in all_stats.values())
-        total_updated = sum(stats["updated"] for stats in all_stats.values())
-        total_errors = sum(stats["errors"] for stats in all_stats.values())
-        
-        # Create a summary of what was archived
+        # Totals and a summary of what was archived, in one pass over the stats
+        total_processed = total_new = total_updated = total_errors = 0
         content_summary = []
         for content_type, stats in all_stats.items():
+            total_processed += stats["processed"]
+            total_new += stats["new"]
+            total_updated += stats["updated"]
+            total_errors += stats["errors"]
             if stats["processed"] > 0:
                 content_summary.append(
                     f"{content_type}: {stats['processed']} processed, "
                     f"{stats['new']} new, {stats['updated']} updated"
                 )
+        if total_errors:
+            content_summary.append("Errors occurred")
         
         if interrupted:
             session_description = f"INTERRUPTED - Archive of {domain} - {', '.join(content_types)}"
@@ -1103,10 +2004,8 @@ class DatabaseManager:
                 total_processed,
                 total_new,
                 total_updated,
-                json.dumps(content_summary) if total_errors == 0 
-                else json.dumps(content_summary + ["Errors occurred"])
+                json.dumps(content_summary)
             ))
-            conn.commit()
     
     def save_failed_verification_session(self, domain: str, reason: str):
         """
@@ -1131,7 +2030,6 @@ class DatabaseManager:
                 0,  # No updated items
                 json.dumps([f"Verification failed: {reason}"])
             ))
-            conn.commit()
     
     # =============================================================================
     # STATISTICS AND REPORTING
@@ -1147,52 +2045,22 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get counts for each content type
-            tables = ['posts', 'comments', 'pages', 'users', 'categories', 'tags']
-            stats = {}
-            
-            for table in tables:
-                cursor.execute(f"SELECT COUNT(DISTINCT wp_id) FROM {table}")
-                stats[f'total_{table}'] = cursor.fetchone()[0]
-            
-            # Lossless-archive stores
-            cursor.execute("SELECT COUNT(*) FROM media WHERE status = 'ok'")
-            stats['total_media'] = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM videos WHERE status = 'downloaded'")
-            stats['total_videos'] = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM (SELECT DISTINCT endpoint, wp_id FROM api_objects)")
-            stats['total_api_objects'] = cursor.fetchone()[0]
-
-            # Get session statistics
-            cursor.execute("SELECT COUNT(*) FROM archive_sessions")
-            stats['total_sessions'] = cursor.fetchone()[0]
+            # All counts in one round trip; content totals come from the
+            # trigger-maintained stats_summary rows.
+            cursor.execute(STATS_COUNTS_SQL)
+            stats = dict(cursor.fetchone())
             
             # Get recent sessions
             cursor.execute("""
                 SELECT content_type, items_processed, session_date
                 FROM archive_sessions 
-                ORDER BY session_date DESC 
+                ORDER BY COALESCE(session_date, '') DESC, id DESC
                 LIMIT 10
             """)
-            stats['recent_sessions'] = [dict(row) for row in cursor.fetchall()]
+            stats['recent_sessions'] = cursor.fetchall()
             
-            # Get last updated timestamp
-            cursor.execute("""
-                SELECT MAX(created_at) as last_updated
-                FROM (
-                    SELECT created_at FROM posts
-                    UNION ALL
-                    SELECT created_at FROM comments
-                    UNION ALL
-                    SELECT created_at FROM pages
-                    UNION ALL
-                    SELECT created_at FROM users
-                    UNION ALL
-                    SELECT created_at FROM categories
-                    UNION ALL
-                    SELECT created_at FROM tags
-                )
-            """)
+            # Get last updated timestamp (per-table MAX, see LAST_UPDATED_SQL)
+            cursor.execute(LAST_UPDATED_SQL)
             result = cursor.fetchone()
             stats['last_updated'] = result[0] if result and result[0] else None
             
@@ -1202,308 +2070,216 @@ class DatabaseManager:
     # WEB APP DATABASE OPERATIONS
     # =============================================================================
     
-    def get_paginated_posts(self, page: int, per_page: int, search: str = "") -> tuple:
+    def get_paginated_listing(self, listing: str, page: int, per_page: int, search: str = "",
+                              after: Optional[str] = None, include_total: bool = True) -> tuple:
         """
-        Get paginated posts with optional search.
+        Get one page of a LISTING_QUERIES listing with optional search.
         
         Args:
+            listing: Listing name (posts, pages, users, categories, tags)
             page: Page number (1-based)
-            per_page: Number of posts per page
-            search: Search term for title/content
+            per_page: Number of items per page
+            search: Search term for the table's text columns
+            after: Cursor from next_page_cursor for the previous page; when
+                valid, the page is found by seeking past it instead of by offset
+            include_total: Count all matches; False skips the COUNT(*) query
             
         Returns:
-            Tuple of (posts_list, total_count, total_pages)
+            Tuple of (items_list, total_count, total_pages), or with
+            include_total=False (items_list, None, has_next)
         """
+        spec = LISTING_QUERIES[listing]
+        prefix = f"{spec.alias}." if spec.alias else ""
         offset = (page - 1) * per_page
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Build search query (restricted to the latest version of each post)
-            conditions = ["(p.wp_id, p.version) IN (SELECT wp_id, MAX(version) FROM posts GROUP BY wp_id)"]
+            # Build search query (restricted to the latest version of each item)
+            conditions = [f"{prefix}is_latest = 1"]
             params = []
             if search:
-                conditions.append("(p.title LIKE ? OR p.content LIKE ?)")
-                params = [f'%{search}%', f'%{search}%']
+                condition, params = self._search_condition(listing, search, spec.alias)
+                conditions.append(condition)
             where_clause = "WHERE " + " AND ".join(conditions)
+            seek, page_params, offset = self._keyset_condition(listing, after, offset)
+            page_clause = f"AND {seek}" if seek else ""
 
-            # Get total count
-            count_query = f"SELECT COUNT(*) FROM posts p {where_clause}"
-            cursor.execute(count_query, params)
-            total_posts = cursor.fetchone()[0]
+            # An unfiltered total comes from stats_summary and a search total
+            # rides along as a window count; without one, fetch a row past the
+            # page to learn whether there is a next page
+            total_column = ", COUNT(*) OVER () AS _total" if include_total and search else ""
             
-            # Get posts for current page with author names
             query = f"""
-                SELECT p.wp_id, p.title, p.excerpt, p.author_id, 
-                       p.date_created, p.date_modified, p.status, p.version, p.created_at,
-                       COALESCE(u.name, 'Unknown') as author_name
-                FROM posts p
-                LEFT JOIN users u ON p.author_id = u.wp_id AND u.version = (
-                    SELECT MAX(version) FROM users WHERE wp_id = u.wp_id
-                )
-                {where_clause}
-                ORDER BY p.date_created DESC
+                SELECT {spec.columns}{total_column}
+                FROM {spec.source}
+                {where_clause} {page_clause}
+                ORDER BY {spec.order_by}
                 LIMIT ? OFFSET ?
             """
-            cursor.execute(query, params + [per_page, offset])
-            posts = cursor.fetchall()
+            cursor.execute(query, params + page_params + [per_page if include_total else per_page + 1, offset])
+            items = cursor.fetchmany(per_page)
+            if not include_total:
+                # Any row still on the cursor is the one fetched past the page
+                return items, None, cursor.fetchone() is not None
+            if not search:
+                total_items = self._summary_total(cursor, listing)
+            else:
+                total_items = self._page_total(
+                    cursor, items, offset, seek,
+                    f"SELECT COUNT(*) FROM {listing} {spec.alias} {where_clause}", params)
         
-        total_pages = (total_posts + per_page - 1) // per_page
-        return posts, total_posts, total_pages
+        total_pages = (total_items + per_page - 1) // per_page
+        return items, total_items, total_pages
+
+    def get_paginated_posts(self, page: int, per_page: int, search: str = "",
+                            after: Optional[str] = None) -> tuple:
+        """Paginated posts with author names; see get_paginated_listing."""
+        return self.get_paginated_listing('posts', page, per_page, search, after)
     
-    def get_paginated_comments(self, page: int, per_page: int, search: str = "") -> tuple:
+    def get_paginated_comments(self, page: int, per_page: int, search: str = "",
+                               after: Optional[str] = None) -> tuple:
         """
         Get paginated comments with optimized performance.
+
+        Pages are memoized. The cache key carries the highest comments/posts
+        row id, which changes with every newly archived comment or post
+        version, and the stored comment generation, which refresh_comment_levels
+        and refresh_comment_post_titles bump when they rewrite rows in place.
+        Both are read from the database, so writes made by another process
+        (the archiver) invalidate this process's cache too.
         
         Args:
             page: Page number (1-based)
             per_page: Number of comments per page
             search: Search term for author/content
+            after: Cursor from next_page_cursor for the previous page; when
+                valid, the page is found by seeking past it instead of by offset
             
         Returns:
             Tuple of (comments_list, total_count, total_pages)
         """
+        with self.get_connection() as conn:
+            salt = tuple(conn.execute(
+                "SELECT (SELECT MAX(id) FROM comments), (SELECT MAX(id) FROM posts), "
+                "(SELECT value FROM archive_meta WHERE key = ?)",
+                (COMMENT_GENERATION_KEY,)
+            ).fetchone())
+
+        comments, total_comments, total_pages = self._comment_page_cache(
+            page, per_page, search, after, salt
+        )
+        return list(comments), total_comments, total_pages
+
+    def _load_comment_page(self, page: int, per_page: int, search: str,
+                           after: Optional[str], salt: tuple) -> tuple:
+        """Uncached body of get_paginated_comments; ``salt`` only keys the cache."""
         offset = (page - 1) * per_page
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Apply SQLite optimizations
-            conn.execute("PRAGMA temp_store = MEMORY")
-            conn.execute("PRAGMA cache_size = 10000")
-            conn.execute("PRAGMA synchronous = NORMAL")
-            
             # Build search query (restricted to the latest version of each comment)
-            conditions = ["(c.wp_id, c.version) IN (SELECT wp_id, MAX(version) FROM comments GROUP BY wp_id)"]
+            conditions = ["c.is_latest = 1"]
             params = []
             if search:
-                conditions.append("(c.author_name LIKE ? OR c.content LIKE ?)")
-                params = [f'%{search}%', f'%{search}%']
+                condition, params = self._search_condition('comments', search, 'c')
+                conditions.append(condition)
             where_clause = "WHERE " + " AND ".join(conditions)
+            seek, page_params, offset = self._keyset_condition('comments', after, offset)
 
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM comments c {where_clause}", params)
-            total_comments = cursor.fetchone()[0]
-            
             # Get comments with optimized query strategy
-            query, query_params = self._build_comments_query(search, per_page, offset)
+            query, query_params = self._build_comments_query(search, per_page, offset, page_params)
             
-            # Execute query
+            # Plain tuples straight into CommentRow, streamed off the cursor
+            # without an intermediate fetchall(). The last column of every row
+            # is the search total (NULL when there is no search).
+            cursor.row_factory = None
             cursor.execute(query, query_params)
-            paginated_comments = cursor.fetchall()
-            
-            # Process results
-            processed_comments = self._process_comments(paginated_comments, search)
+            first = cursor.fetchone()
+            processed_comments = tuple(
+                CommentRow._make(row[:-1]) for row in chain((first,), cursor)
+            ) if first else ()
+            count_sql = f"SELECT COUNT(*) FROM comments c {where_clause}"
+            if not search:
+                total_comments = self._summary_total(cursor, 'comments')
+            elif seek:
+                # The window only counted rows after the cursor
+                cursor.execute(count_sql, params)
+                total_comments = cursor.fetchone()[0]
+            elif first:
+                total_comments = first[-1]
+            else:
+                total_comments = self._window_total(cursor, [], offset, count_sql, params)
         
         total_pages = (total_comments + per_page - 1) // per_page
         return processed_comments, total_comments, total_pages
     
-    def get_paginated_pages(self, page: int, per_page: int, search: str = "") -> tuple:
-        """
-        Get paginated pages with optional search.
-        
-        Args:
-            page: Page number (1-based)
-            per_page: Number of pages per page
-            search: Search term for title/content
-            
-        Returns:
-            Tuple of (pages_list, total_count, total_pages)
-        """
-        offset = (page - 1) * per_page
-        
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build search query (restricted to the latest version of each page)
-            conditions = ["(wp_id, version) IN (SELECT wp_id, MAX(version) FROM pages GROUP BY wp_id)"]
-            params = []
-            if search:
-                conditions.append("(title LIKE ? OR content LIKE ?)")
-                params = [f'%{search}%', f'%{search}%']
-            where_clause = "WHERE " + " AND ".join(conditions)
-
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM pages {where_clause}", params)
-            total_pages_count = cursor.fetchone()[0]
-            
-            # Get pages for current page
-            query = f"""
-                SELECT wp_id, title, excerpt, author_id, date_created, date_modified, 
-                       status, version, created_at
-                FROM pages 
-                {where_clause}
-                ORDER BY date_created DESC
-                LIMIT ? OFFSET ?
-            """
-            cursor.execute(query, params + [per_page, offset])
-            pages = cursor.fetchall()
-        
-        total_pages = (total_pages_count + per_page - 1) // per_page
-        return pages, total_pages_count, total_pages
+    def get_paginated_pages(self, page: int, per_page: int, search: str = "",
+                            after: Optional[str] = None) -> tuple:
+        """Paginated pages; see get_paginated_listing."""
+        return self.get_paginated_listing('pages', page, per_page, search, after)
     
-    def get_paginated_users(self, page: int, per_page: int, search: str = "") -> tuple:
-        """
-        Get paginated users with optional search.
-        
-        Args:
-            page: Page number (1-based)
-            per_page: Number of users per page
-            search: Search term for name/description
-            
-        Returns:
-            Tuple of (users_list, total_count, total_pages)
-        """
-        offset = (page - 1) * per_page
-        
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build search query (restricted to the latest version of each user)
-            conditions = ["(wp_id, version) IN (SELECT wp_id, MAX(version) FROM users GROUP BY wp_id)"]
-            params = []
-            if search:
-                conditions.append("(name LIKE ? OR description LIKE ?)")
-                params = [f'%{search}%', f'%{search}%']
-            where_clause = "WHERE " + " AND ".join(conditions)
-
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM users {where_clause}", params)
-            total_users = cursor.fetchone()[0]
-            
-            # Get users for current page
-            query = f"""
-                SELECT wp_id, name, url, description, link, slug, avatar_urls, 
-                       mpp_avatar, version, created_at
-                FROM users 
-                {where_clause}
-                ORDER BY name ASC
-                LIMIT ? OFFSET ?
-            """
-            cursor.execute(query, params + [per_page, offset])
-            users = cursor.fetchall()
-        
-        total_pages = (total_users + per_page - 1) // per_page
-        return users, total_users, total_pages
+    def get_paginated_users(self, page: int, per_page: int, search: str = "",
+                            after: Optional[str] = None, include_total: bool = True) -> tuple:
+        """Paginated users, ordered by name; see get_paginated_listing."""
+        return self.get_paginated_listing('users', page, per_page, search, after, include_total)
     
-    def get_paginated_categories(self, page: int, per_page: int, search: str = "") -> tuple:
-        """
-        Get paginated categories with optional search.
-        
-        Args:
-            page: Page number (1-based)
-            per_page: Number of categories per page
-            search: Search term for name/description
-            
-        Returns:
-            Tuple of (categories_list, total_count, total_pages)
-        """
-        offset = (page - 1) * per_page
-        
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build search query (restricted to the latest version of each category)
-            conditions = ["(wp_id, version) IN (SELECT wp_id, MAX(version) FROM categories GROUP BY wp_id)"]
-            params = []
-            if search:
-                conditions.append("(name LIKE ? OR description LIKE ?)")
-                params = [f'%{search}%', f'%{search}%']
-            where_clause = "WHERE " + " AND ".join(conditions)
-
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM categories {where_clause}", params)
-            total_categories = cursor.fetchone()[0]
-            
-            # Get categories for current page
-            query = f"""
-                SELECT wp_id, name, description, link, slug, taxonomy, parent, 
-                       count, version, created_at
-                FROM categories 
-                {where_clause}
-                ORDER BY name ASC
-                LIMIT ? OFFSET ?
-            """
-            cursor.execute(query, params + [per_page, offset])
-            categories = cursor.fetchall()
-        
-        total_pages = (total_categories + per_page - 1) // per_page
-        return categories, total_categories, total_pages
+    def get_paginated_categories(self, page: int, per_page: int, search: str = "",
+                                 after: Optional[str] = None, include_total: bool = True) -> tuple:
+        """Paginated categories, ordered by name; see get_paginated_listing."""
+        return self.get_paginated_listing('categories', page, per_page, search, after, include_total)
     
-    def get_paginated_tags(self, page: int, per_page: int, search: str = "") -> tuple:
-        """
-        Get paginated tags with optional search.
-        
-        Args:
-            page: Page number (1-based)
-            per_page: Number of tags per page
-            search: Search term for name/description
-            
-        Returns:
-            Tuple of (tags_list, total_count, total_pages)
-        """
-        offset = (page - 1) * per_page
-        
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build search query (restricted to the latest version of each tag)
-            conditions = ["(wp_id, version) IN (SELECT wp_id, MAX(version) FROM tags GROUP BY wp_id)"]
-            params = []
-            if search:
-                conditions.append("(name LIKE ? OR description LIKE ?)")
-                params = [f'%{search}%', f'%{search}%']
-            where_clause = "WHERE " + " AND ".join(conditions)
-
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM tags {where_clause}", params)
-            total_tags = cursor.fetchone()[0]
-            
-            # Get tags for current page
-            query = f"""
-                SELECT wp_id, name, description, link, slug, taxonomy, count, 
-                       version, created_at
-                FROM tags 
-                {where_clause}
-                ORDER BY name ASC
-                LIMIT ? OFFSET ?
-            """
-            cursor.execute(query, params + [per_page, offset])
-            tags = cursor.fetchall()
-        
-        total_pages = (total_tags + per_page - 1) // per_page
-        return tags, total_tags, total_pages
+    def get_paginated_tags(self, page: int, per_page: int, search: str = "",
+                           after: Optional[str] = None, include_total: bool = True) -> tuple:
+        """Paginated tags, ordered by name; see get_paginated_listing."""
+        return self.get_paginated_listing('tags', page, per_page, search, after, include_total)
     
-    def get_paginated_sessions(self, page: int, per_page: int) -> tuple:
+    def get_paginated_sessions(self, page: int, per_page: int,
+                               after: Optional[str] = None, include_total: bool = True) -> tuple:
         """
         Get paginated archive sessions.
         
         Args:
             page: Page number (1-based)
             per_page: Number of sessions per page
+            after: Cursor from next_page_cursor for the previous page; when
+                valid, the page is found by seeking past it instead of by offset
+            include_total: Report the session count; False skips reading it
             
         Returns:
-            Tuple of (sessions_list, total_count, total_pages)
+            Tuple of (sessions_list, total_count, total_pages), or with
+            include_total=False (sessions_list, None, has_next)
         """
         offset = (page - 1) * per_page
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get total count
-            cursor.execute("SELECT COUNT(*) FROM archive_sessions")
-            total_sessions = cursor.fetchone()[0]
-            
-            # Get sessions for current page
-            query = """
+            seek, page_params, offset = self._keyset_condition('sessions', after, offset)
+            page_clause = f"WHERE {seek}" if seek else ""
+
+            # Get sessions for current page (the total comes from stats_summary;
+            # without one, fetch a row past the page to learn whether there is
+            # a next page). Without JSON1, has_errors is filled in below.
+            has_errors_sql = SESSION_HAS_ERRORS_SQL if self._json1_enabled else "0"
+            query = f"""
                 SELECT id, content_type, items_processed, items_new, items_updated, 
-                       errors, session_date
+                       errors, session_date, {has_errors_sql} AS has_errors
                 FROM archive_sessions 
-                ORDER BY session_date DESC
+                {page_clause}
+                ORDER BY COALESCE(session_date, '') DESC, id DESC
                 LIMIT ? OFFSET ?
             """
-            cursor.execute(query, [per_page, offset])
-            sessions = cursor.fetchall()
+            cursor.execute(query, page_params + [per_page if include_total else per_page + 1, offset])
+            sessions = cursor.fetchmany(per_page)
+            if not self._json1_enabled:
+                sessions = [dict(row, has_errors=session_has_errors(row['errors']))
+                            for row in sessions]
+            if not include_total:
+                # Any row still on the cursor is the one fetched past the page
+                return sessions, None, cursor.fetchone() is not None
+            total_sessions = self._summary_total(cursor, 'archive_sessions')
         
         total_pages = (total_sessions + per_page - 1) // per_page
         return sessions, total_sessions, total_pages
@@ -1511,6 +2287,10 @@ class DatabaseManager:
     def get_session_by_id(self, session_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a specific archive session by ID.
+
+        Sessions are never modified once written, so found sessions are
+        memoized by id. A missing id is not cached (the loader raises), so a
+        session archived later is still found.
         
         Args:
             session_id: Archive session ID
@@ -1518,6 +2298,13 @@ class DatabaseManager:
         Returns:
             Session data as dictionary or None if not found
         """
+        try:
+            return dict(self._session_cache(session_id))
+        except LookupError:
+            return None
+
+    def _load_session(self, session_id: int) -> Dict[str, Any]:
+        """Uncached body of get_session_by_id; raises LookupError if absent."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -1527,12 +2314,17 @@ class DatabaseManager:
                 WHERE id = ?
             """, (session_id,))
             session = cursor.fetchone()
-            
-            return dict(session) if session else None
+            if session is None:
+                raise LookupError(session_id)
+            return dict(session)
     
     def get_post_comments(self, wp_id: int) -> List[Dict[str, Any]]:
         """
         Get comments for a specific post with proper threading.
+
+        Threaded lists are memoized. The cache key carries the highest comments
+        row id, so any newly archived comment or comment version invalidates
+        it. The comment dicts are shared between calls; treat them as read-only.
         
         Args:
             wp_id: WordPress post ID
@@ -1540,6 +2332,12 @@ class DatabaseManager:
         Returns:
             List of comments with proper threading levels
         """
+        with self.get_connection() as conn:
+            salt = conn.execute("SELECT MAX(id) FROM comments").fetchone()[0]
+        return list(self._post_comments_cache(wp_id, salt))
+
+    def _load_post_comments(self, wp_id: int, salt: Optional[int]) -> tuple:
+        """Uncached body of get_post_comments; ``salt`` only keys the cache."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -1547,38 +2345,26 @@ class DatabaseManager:
                        date_created, status, version, parent_id
                 FROM comments
                 WHERE post_id = ?
-                AND (wp_id, version) IN (SELECT wp_id, MAX(version) FROM comments GROUP BY wp_id)
+                AND is_latest = 1
                 ORDER BY date_created ASC
             """, (wp_id,))
-            all_comments = cursor.fetchall()
             
-            # Convert to list of dicts
-            comment_dicts = []
-            for comment in all_comments:
-                parent_id = comment[8] if comment[8] != 0 else None
-                comment_dicts.append({
-                    'wp_id': comment[0],
-                    'author_name': comment[1],
-                    'author_email': comment[2],
-                    'author_url': comment[3],
-                    'content': comment[4],
-                    'date_created': comment[5],
-                    'status': comment[6],
-                    'version': comment[7],
-                    'parent_id': parent_id,
-                    'replies': []
-                })
+            # Convert to list of dicts straight off the cursor (no fetchall()
+            # list of rows alongside the dicts); dict(row) maps the columns by
+            # name in C rather than indexing each one from Python
+            comment_dicts = [{**dict(comment), 'replies': []} for comment in cursor]
             
             # Thread the comments for display. Lossless: every archived comment
             # is emitted exactly once, even if its parent is missing from this
             # set (orphaned by version filtering / deletion) or forms a cycle.
-            return self._thread_comments(comment_dicts)
+            return tuple(self._thread_comments(comment_dicts))
     
     # =============================================================================
     # PRIVATE HELPER METHODS
     # =============================================================================
     
-    def _build_comments_query(self, search: str, per_page: int, offset: int) -> tuple:
+    def _build_comments_query(self, search: str, per_page: int, offset: int,
+                              page_params: Optional[list] = None) -> tuple:
         """
         Build the appropriate comments query based on search requirements.
         
@@ -1586,6 +2372,7 @@ class DatabaseManager:
             search: Search term
             per_page: Number of comments per page
             offset: Query offset
+            page_params: Keyset cursor key from _keyset_condition, if seeking
             
         Returns:
             Tuple of (query_string, query_parameters)
@@ -1593,68 +2380,27 @@ class DatabaseManager:
         # Flat, paginated query for both modes. Search results span many posts, so
         # a threaded view isn't meaningful — and the old recursive CTE walked the
         # entire comment forest, which hung on large archives for a broad term
-        # (e.g. ?search=a over 100k+ comments). Levels are computed per page in
-        # _process_comments / _calculate_comment_levels instead.
-        base = """
-                SELECT
-                    c.wp_id, c.author_name, c.author_email, c.author_url, c.content,
-                    c.date_created, c.status, c.version, c.parent_id,
-                    p.title as post_title, COALESCE(c.post_id, p.wp_id) as post_id
-                FROM comments c
-                LEFT JOIN posts p ON c.post_id = p.wp_id
-                    AND (p.wp_id, p.version) IN (SELECT wp_id, MAX(version) FROM posts GROUP BY wp_id)
-                WHERE (c.wp_id, c.version) IN (SELECT wp_id, MAX(version) FROM comments GROUP BY wp_id)
-        """
+        # (e.g. ?search=a over 100k+ comments). Levels come from the thread
+        # position stored at ingest time (comments.level) instead.
+        #
+        # Id-first, hydrate-later (see COMMENTS_PAGE_SQL). Every variant is a
+        # fixed string, so sqlite3's per-connection statement cache can reuse
+        # the compiled statement across calls.
+        page_params = page_params or []
         if search:
-            query = base + """
-                AND (c.author_name LIKE ? OR c.content LIKE ?)
-                ORDER BY c.date_created DESC
-                LIMIT ? OFFSET ?
-            """
-            query_params = [f'%{search}%', f'%{search}%', per_page, offset]
+            if self._fts_enabled and len(search) >= FTS_MIN_TERM_LENGTH:
+                mode = 'fts'
+            else:
+                mode = 'like'
+            _, search_params = self._search_condition('comments', search)
         else:
-            query = base + """
-                ORDER BY c.date_created DESC
-                LIMIT ? OFFSET ?
-            """
-            query_params = [per_page, offset]
+            mode = 'all'
+            search_params = []
+        query = self._stmt_comments[mode, bool(page_params)]
+        query_params = search_params + page_params + [per_page, offset]
         
         return query, query_params
     
-    def _process_comments(self, paginated_comments: List[tuple], search: str) -> List[Dict[str, Any]]:
-        """
-        Process raw comment data into structured format.
-        
-        Args:
-            paginated_comments: Raw comment data from database
-            search: Search term (if any)
-            
-        Returns:
-            Processed comments with proper structure
-        """
-        comments = []
-        for comment in paginated_comments:
-            parent_id = comment[8] if comment[8] != 0 else None
-            comments.append({
-                'wp_id': comment[0],
-                'author_name': comment[1],
-                'author_email': comment[2],
-                'author_url': comment[3],
-                'content': comment[4],
-                'date_created': comment[5],
-                'status': comment[6],
-                'version': comment[7],
-                'parent_id': parent_id,
-                'post_title': comment[9],
-                'post_id': comment[10]
-            })
-
-        # Both modes return a flat page; derive each comment's indent level from
-        # the parent chain present within the page (cycle-guarded).
-        self._calculate_comment_levels(comments)
-
-        return comments
-    
     def _thread_comments(self, comments: List[Dict]) -> List[Dict]:
         """
         Order threaded comments for display without losing any.
@@ -1670,7 +2416,7 @@ class DatabaseManager:
             comments: Comment dicts (each with a mutable 'replies' list), date-asc
 
         Returns:
-            Flattened list of comments with a 'level' set for indentation
+            Flattened list of comments with 'level' and 'indent_px' set
         """
         by_id = {c['wp_id']: c for c in comments}
         roots: List[Dict] = []
@@ -1695,6 +2441,7 @@ class DatabaseManager:
                     continue
                 visited.add(node['wp_id'])
                 node['level'] = level
+                node['indent_px'] = min(level * COMMENT_INDENT_PX, COMMENT_INDENT_MAX_PX)
                 ordered.append(node)
                 for child in reversed(node['replies']):
                     stack.append((child, level + 1))
@@ -1705,21 +2452,3 @@ class DatabaseManager:
             if c['wp_id'] not in visited:
                 _emit([c])
         return ordered
-    
-    def _calculate_comment_levels(self, comments: List[Dict[str, Any]]):
-        """
-        Calculate comment nesting levels efficiently.
-        
-        Args:
-            comments: List of comment dictionaries to process
-        """
-        comment_dict = {c['wp_id']: c for c in comments}
-        for comment in comments:
-            level = 0
-            seen = {comment['wp_id']}   # guard against parent cycles
-            current_parent = comment['parent_id']
-            while current_parent and current_parent in comment_dict and current_parent not in seen:
-                level += 1
-                seen.add(current_parent)
-                current_parent = comment_dict[current_parent]['parent_id']
-            comment['level'] = level 
\ No newline at end of file
@@ -12,14 +12,21 @@ import re
 import time
 import sqlite3
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, send_file, current_app
+from flask import (Flask, render_template, request, jsonify, redirect, url_for, Response, send_file,
+                   current_app, stream_with_context, make_response)
 from markupsafe import Markup
 import html
 
-from .database import DatabaseManager
+try:
+    import orjson  # optional speedup (pip install -e .[speedups])
+except ImportError:
+    orjson = None
+
+from .database import DatabaseManager, next_page_cursor
 from .content_processor import (normalize_asset_url, url_hash, is_archivable_asset,
                                 extract_video_embeds, _VIDEO_HOSTS,
                                 _split_permalink, resolve_internal_link)
@@ -34,6 +41,8 @@ app = Flask(__name__, template_folder=Path(__file__).parent / 'templates')
 app.config['DATABASE'] = 'wordpress_archive.db'
 app.config['POSTS_PER_PAGE'] = 6
 app.config['COMMENTS_PER_PAGE'] = 20
+# How long the home page reuses archive statistics before re-reading them
+app.config['STATS_CACHE_SECONDS'] = 30
 
 # Enable SQLite optimizations
 sqlite3.enable_callback_tracebacks(True)
@@ -59,6 +68,9 @@ _permalink_map_cache = None
 _archived_post_ids_cache = None
 _archived_page_ids_cache = None
 _site_host_cache = None
+# Rendered bodies, keyed on the stored text. The rewrite depends on the caches
+# above, so the memo is cleared whenever the downloaded-video set changes.
+RENDER_HTML_CACHE_SIZE = 512
 
 # Precompiled regexes for URL rewriting (no BeautifulSoup dependency).
 _REWRITE_IMG_SRC_RX = re.compile(
@@ -111,18 +123,19 @@ def render_html(text: str) -> str:
     """
     if not text:
         return ""
-    decoded = html.unescape(text)
 
     # Lazy-load caches on first use (app context must be active).
     global _site_url_cache, _video_hash_cache, _video_cache_loaded_at
     if _site_url_cache is None:
         _site_url_cache = get_db_manager().get_meta('site_url') or ''
     if _video_hash_cache is None or time.time() - _video_cache_loaded_at > 60:
-        _video_hash_cache = get_db_manager().downloaded_video_hashes()
+        videos = get_db_manager().downloaded_video_hashes()
+        if videos != _video_hash_cache:
+            _video_hash_cache = videos
+            _render_rewritten_html.cache_clear()
         _video_cache_loaded_at = time.time()
 
     site_url = _site_url_cache
-    downloaded_videos = _video_hash_cache
 
     # Build the internal-link index once (read-only; cached for the process).
     global _permalink_map_cache, _archived_post_ids_cache, _archived_page_ids_cache
@@ -143,6 +156,16 @@ def render_html(text: str) -> str:
         _archived_page_ids_cache = page_ids
         _site_host_cache = site_host
 
+    return _render_rewritten_html(text)
+
+
+@lru_cache(maxsize=RENDER_HTML_CACHE_SIZE)
+def _render_rewritten_html(text: str) -> Markup:
+    """Unescape and rewrite one stored body; render_html loads the caches first."""
+    decoded = html.unescape(text)
+    site_url = _site_url_cache
+    downloaded_videos = _video_hash_cache
+
     # --- Replace video iframes that have been downloaded with <video> ---
     def _replace_video_iframe(m):
         src = m.group(1).strip()
@@ -231,19 +254,6 @@ def render_html(text: str) -> str:
     return Markup(decoded)
 
 
-def calculate_indentation(level: int) -> int:
-    """
-    Calculate indentation for comment levels, capped at 200px.
-    
-    Args:
-        level: Comment nesting level
-        
-    Returns:
-        Indentation in pixels (capped at 200px)
-    """
-    return min(level * 20, 200)
-
-
 _db_manager = None
 
 def get_db_manager() -> DatabaseManager:
@@ -251,14 +261,81 @@ def get_db_manager() -> DatabaseManager:
     global _db_manager
     db_path = app.config['DATABASE']
     if _db_manager is None or str(_db_manager.db_path) != db_path:
+        if _db_manager is not None:
+            _db_manager.close_all()
         _db_manager = DatabaseManager(db_path)
     return _db_manager
 
 
+# Archive statistics as (db_path, stats), and when they were read. Stats move
+# slowly next to the request rate; see STATS_CACHE_SECONDS.
+_stats_cache = None
+_stats_cached_at = 0.0
+
+
 def get_archive_stats() -> Dict[str, Any]:
-    """Get overall archive statistics."""
+    """Get overall archive statistics, re-read at most every STATS_CACHE_SECONDS."""
+    global _stats_cache, _stats_cached_at
     db = get_db_manager()
-    return db.get_stats()
+    now = time.time()
+    if (_stats_cache is None or _stats_cache[0] != db.db_path
+            or now - _stats_cached_at > app.config['STATS_CACHE_SECONDS']):
+        _stats_cache = (db.db_path, db.get_stats())
+        _stats_cached_at = now
+    return _stats_cache[1]
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Encode one object as UTF-8 JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: Any) -> Any:
+    """Decode one JSON document, via orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the stdlib exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def stream_comments_json(comments):
+    """
+    Yield a JSON array of comments piecewise.
+
+    Each record is encoded and sent on its own, so the full document is never
+    built in memory alongside the rows it came from.
+    """
+    yield b'['
+    first = True
+    for comment in comments:
+        yield (b'' if first else b',') + _json_bytes(comment._asdict())
+        first = False
+    yield b']'
+
+
+def stream_template_response(template_name: str, **context) -> Response:
+    """
+    Render a template as a streamed HTML response.
+
+    Output is flushed in small buffered chunks while the template loops over
+    its rows, instead of being joined into one string before sending.
+
+    Args:
+        template_name: Template to render
+        **context: Template variables
+
+    Returns:
+        Streaming text/html response
+    """
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template(template_name).stream(context)
+    stream.enable_buffering(50)
+    return Response(stream_with_context(stream), mimetype='text/html')
 
 
 
@@ -269,7 +346,6 @@ def get_archive_stats() -> Dict[str, Any]:
 # =============================================================================
 
 app.jinja_env.filters['render_html'] = render_html
-app.jinja_env.filters['calculate_indentation'] = calculate_indentation
 
 
 def rewrite_url(url):
@@ -290,6 +366,19 @@ def rewrite_url(url):
 
 app.jinja_env.filters['rewrite_url'] = rewrite_url
 
+
+def pretty_json(raw_json):
+    """Jinja filter: indent a stored raw_json string, or return it unchanged."""
+    if not raw_json:
+        return raw_json
+    try:
+        return json.dumps(json.loads(raw_json), indent=2, ensure_ascii=False)
+    except (json.JSONDecodeError, TypeError):
+        return raw_json
+
+
+app.jinja_env.filters['pretty_json'] = pretty_json
+
 # =============================================================================
 # CONTEXT PROCESSORS
 # =============================================================================
@@ -332,11 +421,63 @@ def set_security_headers(response):
 # ROUTE HANDLERS - MAIN PAGES
 # =============================================================================
 
+def conditional_response(body: str, max_age: int = 0) -> Response:
+    """
+    Wrap a rendered page in a response that clients revalidate by ETag.
+
+    The ETag is a hash of the body, so a client already holding the current
+    page gets an empty 304 instead of the page again.
+
+    Args:
+        body: Rendered page
+        max_age: Seconds clients may reuse the page before revalidating
+
+    Returns:
+        Response, or 304 Not Modified when If-None-Match matches
+    """
+    response = make_response(body)
+    if max_age:
+        response.cache_control.max_age = max_age
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def render_listing(listing: str, total_name: str) -> str:
+    """
+    Shared body of the paginated, searchable listing routes.
+
+    Reads page/search/after from the query string, fetches the page through
+    DatabaseManager.get_paginated_listing and renders ``<listing>.html`` with
+    the rows under the listing's name.
+
+    Args:
+        listing: LISTING_QUERIES listing name (posts, pages, users, ...)
+        total_name: Template variable that receives the total match count
+    """
+    page = request.args.get('page', 1, type=int)
+    search = request.args.get('search', '')
+    after = request.args.get('after')
+    per_page = app.config['POSTS_PER_PAGE']
+    
+    db = get_db_manager()
+    rows, total, total_pages = db.get_paginated_listing(listing, page, per_page, search, after)
+    
+    return render_template(f'{listing}.html',
+                           page=page,
+                           total_pages=total_pages,
+                           search=search,
+                           next_after=next_page_cursor(listing, rows),
+                           **{listing: rows, total_name: total})
+
+
 @app.route('/')
 def index():
     """Home page with overview and statistics."""
     stats = get_archive_stats()
-    return render_template('index.html', stats=stats)
+    # The page only changes when the cached stats do, so let browsers and
+    # proxies reuse it for as long and revalidate it by ETag after that
+    return conditional_response(render_template('index.html', stats=stats),
+                                app.config['STATS_CACHE_SECONDS'])
 
 
 @app.route('/posts')
@@ -347,20 +488,9 @@ def posts():
     Query Parameters:
         page: Page number (default: 1)
         search: Search term for title/content
+        after: Keyset cursor for the page after the previous one (Next link)
     """
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    per_page = app.config['POSTS_PER_PAGE']
-    
-    db = get_db_manager()
-    posts, total_posts, total_pages = db.get_paginated_posts(page, per_page, search)
-    
-    return render_template('posts.html', 
-                         posts=posts, 
-                         page=page, 
-                         total_pages=total_pages,
-                         total_posts=total_posts,
-                         search=search)
+    return render_listing('posts', 'total_posts')
 
 
 @app.route('/posts/<int:wp_id>')
@@ -378,47 +508,42 @@ def post_detail(wp_id):
 
     db = get_db_manager()
 
-    # Always load the full version history so the version switcher stays
-    # available. When a specific version is requested, surface it as the
-    # displayed one (post_versions[0]) without dropping the other versions
-    # the switcher needs to navigate between them.
-    post_versions = db.get_content_versions('posts', wp_id)
-    if not post_versions:
-        return "Post not found", 404
-    if version:
-        selected = [p for p in post_versions if p['version'] == version]
-        if selected:
-            others = [p for p in post_versions if p['version'] != version]
-            post_versions = selected + others
-    if version and not selected:
-        return ("Post version not found", 404)
-
-    # Get comments for this post
-    comments = db.get_post_comments(wp_id)
-
-    # Get categories and tags for the displayed (front) version.
-    post_version = post_versions[0]['version']
-    categories = db.get_post_categories(wp_id, post_version)
-    tags = db.get_post_tags(wp_id, post_version)
-    
-    # Get author names for all post versions
-    for post_version_item in post_versions:
-        author_id = post_version_item.get('author_id')
-        if author_id:
-            author_versions = db.get_content_versions('users', author_id)
-            if author_versions:
-                post_version_item['author_name'] = author_versions[0].get('name', 'Unknown')
-            else:
-                post_version_item['author_name'] = 'Unknown'
-        else:
-            post_version_item['author_name'] = 'Unknown'
-    
-    return render_template('post_detail.html', 
-                         post_versions=post_versions,
-                         comments=comments,
-                         categories=categories,
-                         tags=tags,
-                         selected_version=version)
+    # One read snapshot for every query behind the page
+    with db.read_transaction():
+        # Always load the full version history so the version switcher stays
+        # available. When a specific version is requested, surface it as the
+        # displayed one (post_versions[0]) without dropping the other versions
+        # the switcher needs to navigate between them.
+        post_versions = [dict(row) for row in db.get_content_versions('posts', wp_id)]
+        if not post_versions:
+            return "Post not found", 404
+        if version:
+            selected = next((p for p in post_versions if p['version'] == version), None)
+            if selected is None:
+                return ("Post version not found", 404)
+            post_versions.remove(selected)
+            post_versions.insert(0, selected)
+
+        # Get comments for this post
+        comments = db.get_post_comments(wp_id)
+
+        # Get categories and tags for the displayed (front) version.
+        post_version = post_versions[0]['version']
+        categories = db.get_post_categories(wp_id, post_version)
+        tags = db.get_post_tags(wp_id, post_version)
+    
+        # Get author names for all post versions in one batch
+        author_names = db.get_user_names(p.get('author_id') for p in post_versions)
+        for post_version_item in post_versions:
+            post_version_item['author_name'] = author_names.get(
+                post_version_item.get('author_id'), 'Unknown')
+    
+    return conditional_response(render_template('post_detail.html', 
+                                              post_versions=post_versions,
+                                              comments=comments,
+                                              categories=categories,
+                                              tags=tags,
+                                              selected_version=version))
 
 
 @app.route('/comments')
@@ -429,20 +554,29 @@ def comments():
     Query Parameters:
         page: Page number (default: 1)
         search: Search term for author/content
+        after: Keyset cursor for the page after the previous one (Next link)
+        format: 'json' to return the page as a streamed JSON array
     """
     page = request.args.get('page', 1, type=int)
     search = request.args.get('search', '')
+    after = request.args.get('after')
     per_page = app.config['COMMENTS_PER_PAGE']
     
     db = get_db_manager()
-    comments, total_comments, total_pages = db.get_paginated_comments(page, per_page, search)
+    comments, total_comments, total_pages = db.get_paginated_comments(page, per_page, search, after)
+
+    if request.args.get('format') == 'json':
+        return Response(stream_comments_json(comments), mimetype='application/json',
+                        headers={'X-Total-Count': str(total_comments),
+                                 'X-Total-Pages': str(total_pages)})
     
     return render_template('comments.html', 
                          comments=comments, 
                          page=page, 
                          total_pages=total_pages,
                          total_comments=total_comments,
-                         search=search)
+                         search=search,
+                         next_after=next_page_cursor('comments', comments))
 
 
 @app.route('/pages')
@@ -453,20 +587,9 @@ def pages():
     Query Parameters:
         page: Page number (default: 1)
         search: Search term for title/content
+        after: Keyset cursor for the page after the previous one (Next link)
     """
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    per_page = app.config['POSTS_PER_PAGE']
-    
-    db = get_db_manager()
-    pages, total_pages_count, total_pages = db.get_paginated_pages(page, per_page, search)
-    
-    return render_template('pages.html', 
-                         pages=pages, 
-                         page=page, 
-                         total_pages=total_pages,
-                         total_pages_count=total_pages_count,
-                         search=search)
+    return render_listing('pages', 'total_pages_count')
 
 
 @app.route('/pages/<int:wp_id>')
@@ -483,7 +606,7 @@ def page_detail(wp_id):
     if not page_versions:
         return "Page not found", 404
     
-    return render_template('page_detail.html', page_versions=page_versions)
+    return conditional_response(render_template('page_detail.html', page_versions=page_versions))
 
 
 @app.route('/users')
@@ -494,20 +617,9 @@ def users():
     Query Parameters:
         page: Page number (default: 1)
         search: Search term for name/description
+        after: Keyset cursor for the page after the previous one (Next link)
     """
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    per_page = app.config['POSTS_PER_PAGE']
-    
-    db = get_db_manager()
-    users, total_users, total_pages = db.get_paginated_users(page, per_page, search)
-    
-    return render_template('users.html', 
-                         users=users, 
-                         page=page, 
-                         total_pages=total_pages,
-                         total_users=total_users,
-                         search=search)
+    return render_listing('users', 'total_users')
 
 
 @app.route('/users/<int:wp_id>')
@@ -522,7 +634,7 @@ def user_detail(wp_id):
     per_page = app.config['POSTS_PER_PAGE']
     
     db = get_db_manager()
-    user_versions = db.get_content_versions('users', wp_id)
+    user_versions = [dict(row) for row in db.get_content_versions('users', wp_id)]
     
     if not user_versions:
         return "User not found", 404
@@ -544,12 +656,12 @@ def user_detail(wp_id):
     # Get posts by this author
     posts, total_posts, total_pages = db.get_posts_by_author(wp_id, page, per_page)
     
-    return render_template('user_detail.html', 
-                         user_versions=user_versions,
-                         posts=posts,
-                         page=page,
-                         total_pages=total_pages,
-                         total_posts=total_posts)
+    return conditional_response(render_template('user_detail.html', 
+                                              user_versions=user_versions,
+                                              posts=posts,
+                                              page=page,
+                                              total_pages=total_pages,
+                                              total_posts=total_posts))
 
 
 @app.route('/categories')
@@ -560,20 +672,9 @@ def categories():
     Query Parameters:
         page: Page number (default: 1)
         search: Search term for name/description
+        after: Keyset cursor for the page after the previous one (Next link)
     """
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    per_page = app.config['POSTS_PER_PAGE']
-    
-    db = get_db_manager()
-    categories, total_categories, total_pages = db.get_paginated_categories(page, per_page, search)
-    
-    return render_template('categories.html', 
-                         categories=categories, 
-                         page=page, 
-                         total_pages=total_pages,
-                         total_categories=total_categories,
-                         search=search)
+    return render_listing('categories', 'total_categories')
 
 
 @app.route('/categories/<int:wp_id>')
@@ -596,12 +697,12 @@ def category_detail(wp_id):
     # Get posts for this category
     posts, total_posts, total_pages = db.get_posts_by_category(wp_id, page, per_page)
     
-    return render_template('category_detail.html', 
-                         category_versions=category_versions,
-                         posts=posts,
-                         page=page,
-                         total_pages=total_pages,
-                         total_posts=total_posts)
+    return conditional_response(render_template('category_detail.html', 
+                                              category_versions=category_versions,
+                                              posts=posts,
+                                              page=page,
+                                              total_pages=total_pages,
+                                              total_posts=total_posts))
 
 
 @app.route('/tags')
@@ -612,20 +713,9 @@ def tags():
     Query Parameters:
         page: Page number (default: 1)
         search: Search term for name/description
+        after: Keyset cursor for the page after the previous one (Next link)
     """
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    per_page = app.config['POSTS_PER_PAGE']
-    
-    db = get_db_manager()
-    tags, total_tags, total_pages = db.get_paginated_tags(page, per_page, search)
-    
-    return render_template('tags.html', 
-                         tags=tags, 
-                         page=page, 
-                         total_pages=total_pages,
-                         total_tags=total_tags,
-                         search=search)
+    return render_listing('tags', 'total_tags')
 
 
 @app.route('/tags/<int:wp_id>')
@@ -648,12 +738,12 @@ def tag_detail(wp_id):
     # Get posts for this tag
     posts, total_posts, total_pages = db.get_posts_by_tag(wp_id, page, per_page)
     
-    return render_template('tag_detail.html', 
-                         tag_versions=tag_versions,
-                         posts=posts,
-                         page=page,
-                         total_pages=total_pages,
-                         total_posts=total_posts)
+    return conditional_response(render_template('tag_detail.html', 
+                                              tag_versions=tag_versions,
+                                              posts=posts,
+                                              page=page,
+                                              total_pages=total_pages,
+                                              total_posts=total_posts))
 
 
 @app.route('/sessions')
@@ -663,57 +753,24 @@ def sessions():
     
     Query Parameters:
         page: Page number (default: 1)
+        after: Keyset cursor for the page after the previous one
     """
     page = request.args.get('page', 1, type=int)
+    after = request.args.get('after')
     per_page = app.config['POSTS_PER_PAGE']
     
     db = get_db_manager()
-    sessions, total_sessions, total_pages = db.get_paginated_sessions(page, per_page)
-    
-    # Parse errors and content types for each session
-    parsed_sessions = []
-    for session in sessions:
-        # Convert sqlite3.Row to dict first
-        session_dict = dict(session)
-        
-        # Parse errors - check if errors field contains actual error messages
-        has_errors = False
-        if session_dict.get('errors'):
-            try:
-                errors_json = session_dict['errors']
-                if isinstance(errors_json, str):
-                    errors_list = json.loads(errors_json)
-                elif isinstance(errors_json, list):
-                    errors_list = errors_json
-                else:
-                    errors_list = []
-                
-                # Check if any item in the list is an actual error message
-                # Content summaries don't count as errors
-                if isinstance(errors_list, list):
-                    error_indicators = ['error', 'failed', 'exception', 'errors occurred']
-                    has_errors = any(
-                        any(indicator in str(item).lower() for indicator in error_indicators)
-                        for item in errors_list
-                    )
-            except (json.JSONDecodeError, TypeError):
-                # If parsing fails, check if the string contains error indicators
-                errors_str = str(session_dict.get('errors', '')).lower()
-                has_errors = 'error' in errors_str or 'failed' in errors_str
-        
-        # Parse content type
-        parsed_ct = _parse_content_type(session_dict.get('content_type', ''))
-        
-        # Add parsed info to session dict
-        session_dict['has_errors'] = has_errors
-        session_dict['parsed_content_type'] = parsed_ct
-        parsed_sessions.append(session_dict)
+    # The sessions page shows no page count, so skip the COUNT(*) query
+    sessions, total_sessions, has_next = db.get_paginated_sessions(
+        page, per_page, after, include_total=False)
     
+    # Rows go to the template as they are: has_errors comes from the query and
+    # the description is parsed there by the parse_content_type filter
     return render_template('sessions.html', 
-                         sessions=parsed_sessions, 
+                         sessions=sessions, 
                          page=page, 
-                         total_pages=total_pages,
-                         total_sessions=total_sessions)
+                         has_next=has_next,
+                         next_after=next_page_cursor('sessions', sessions))
 
 
 @app.route('/sessions/<int:session_id>')
@@ -736,7 +793,7 @@ def session_detail(session_id):
         try:
             errors_json = session['errors']
             if isinstance(errors_json, str):
-                errors_list = json.loads(errors_json)
+                errors_list = _json_loads(errors_json)
             elif isinstance(errors_json, list):
                 errors_list = errors_json
             else:
@@ -760,15 +817,30 @@ def session_detail(session_id):
     content_type = session.get('content_type', '')
     parsed_content_type = _parse_content_type(content_type)
     
-    return render_template('session_detail.html', 
-                         session=session,
-                         errors_data=errors_data,
-                         parsed_content_type=parsed_content_type)
+    return conditional_response(render_template('session_detail.html', 
+                                              session=session,
+                                              errors_data=errors_data,
+                                              parsed_content_type=parsed_content_type))
+
+
+# Session descriptions written by save_comprehensive_session_stats
+# ("[INTERRUPTED - ]Archive of <domain> - <types>") and
+# save_failed_verification_session ("FAILED VERIFICATION - <domain> - <reason>"),
+# told apart in a single match.
+_SESSION_DESCRIPTION_RX = re.compile(
+    r'(?P<interrupted>INTERRUPTED - )?Archive of (?P<domain>.*?) - (?P<types>.*)'
+    r'|FAILED VERIFICATION - (?P<failed_domain>.*?)(?: - (?P<reason>.*))?',
+    re.DOTALL)
 
 
+@lru_cache(maxsize=1024)
 def _parse_content_type(content_type_str: str) -> Dict[str, Any]:
     """
     Parse content type string to extract meaningful information.
+
+    Memoized: session listings repeat the same few descriptions, so most rows
+    are a cache hit. The returned dict is shared between callers; treat it
+    as read-only.
     
     Args:
         content_type_str: Content type string from database
@@ -779,65 +851,45 @@ def _parse_content_type(content_type_str: str) -> Dict[str, Any]:
     if not content_type_str:
         return {'type': 'unknown', 'display': 'Unknown', 'types': []}
     
-    # Check for comprehensive archive sessions
-    if 'Archive of' in content_type_str:
-        parts = content_type_str.split(' - ', 1)
-        if len(parts) == 2:
-            domain = parts[0].replace('Archive of ', '').strip()
-            types_str = parts[1]
-            types_list = [t.strip() for t in types_str.split(',')]
-            
-            # If only one type, treat it as a single type, not comprehensive
-            if len(types_list) == 1:
-                type_name = types_list[0].lower()
-                return {
-                    'type': 'single',
-                    'display': types_list[0].title(),
-                    'types': [type_name]
-                }
-            
-            # Multiple types or empty - this is a complete archive
+    match = _SESSION_DESCRIPTION_RX.fullmatch(content_type_str)
+    
+    # Comprehensive archive sessions, possibly interrupted
+    if match and match.group('domain') is not None:
+        domain = match.group('domain').strip()
+        types_list = [t.strip() for t in match.group('types').split(',')]
+        
+        if match.group('interrupted'):
             return {
-                'type': 'comprehensive',
-                'display': 'Complete Archive',
+                'type': 'interrupted',
+                'display': 'Interrupted Archive',
                 'domain': domain,
                 'types': types_list
             }
-    
-    # Check for interrupted sessions
-    if 'INTERRUPTED' in content_type_str:
-        parts = content_type_str.split(' - ', 1)
-        if len(parts) >= 2:
-            rest = parts[1]
-            if 'Archive of' in rest:
-                archive_parts = rest.split(' - ', 1)
-                if len(archive_parts) == 2:
-                    domain = archive_parts[0].replace('Archive of ', '').strip()
-                    types_str = archive_parts[1]
-                    types_list = [t.strip() for t in types_str.split(',')]
-                    return {
-                        'type': 'interrupted',
-                        'display': 'Interrupted Archive',
-                        'domain': domain,
-                        'types': types_list
-                    }
+        
+        # If only one type, treat it as a single type, not comprehensive
+        if len(types_list) == 1:
+            type_name = types_list[0].lower()
+            return {
+                'type': 'single',
+                'display': types_list[0].title(),
+                'types': [type_name]
+            }
+        
+        # Multiple types or empty - this is a complete archive
         return {
-            'type': 'interrupted',
-            'display': 'Interrupted',
-            'domain': None,
-            'types': []
+            'type': 'comprehensive',
+            'display': 'Complete Archive',
+            'domain': domain,
+            'types': types_list
         }
     
     # Check for failed verification
-    if 'FAILED VERIFICATION' in content_type_str:
-        parts = content_type_str.split(' - ', 2)
-        domain = parts[1] if len(parts) > 1 else None
-        reason = parts[2] if len(parts) > 2 else None
+    if match:
         return {
             'type': 'failed_verification',
             'display': 'Failed Verification',
-            'domain': domain,
-            'reason': reason
+            'domain': match.group('failed_domain'),
+            'reason': match.group('reason')
         }
     
     # Single content type (normal case)
@@ -857,6 +909,9 @@ def _parse_content_type(content_type_str: str) -> Dict[str, Any]:
     }
 
 
+app.jinja_env.filters['parse_content_type'] = _parse_content_type
+
+
 # =============================================================================
 # ROUTE HANDLERS - MEDIA & RAW API
 # =============================================================================
@@ -917,23 +972,12 @@ def raw_objects(endpoint_name):
     db = get_db_manager()
     lookup = '/' + endpoint_name.lstrip('/')
     rows, total, total_pages = db.get_paginated_api_objects(lookup, page, per_page)
-    objects_data = []
-    for row in rows:
-        obj = dict(row)
-        if obj.get('raw_json'):
-            try:
-                obj['pretty_json'] = json.dumps(
-                    json.loads(obj['raw_json']),
-                    indent=2,
-                    ensure_ascii=False
-                )
-            except (json.JSONDecodeError, TypeError):
-                obj['pretty_json'] = obj['raw_json']
-        objects_data.append(obj)
-    return render_template(
+    # Up to 200 pretty-printed objects per page: stream them rather than
+    # building the whole document first (the pretty_json filter runs per row).
+    return stream_template_response(
         'raw_objects.html',
         endpoint=endpoint_name,
-        objects=objects_data,
+        objects=rows,
         page=page,
         total_pages=total_pages,
         total=total,